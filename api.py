@@ -1,13 +1,95 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, send_file, stream_with_context, url_for
+import json
 import os
+import re
 import sys
 import tempfile
 import threading
-from main import get_news_articles, process_news_articles, generate_speech_for_analysis
+import time
+from main import (
+    get_news_articles, collapse_near_duplicates, process_news_articles, process_news_batch, iter_processed_articles,
+    perform_comparative_analysis, generate_speech_for_analysis, generate_speech_multi, normalize_query, warmup,
+    get_news_cache_stats, get_nlp_cache_stats, get_audio_cache_stats, audio_cache, LANGUAGE_CODES
+)
+from jobs import JobManager, QueueFullError, SingleFlight
+from history import HistoryStore
+from metrics import Registry, registry
+from profiling import new_request_id, profile_run, profiling_requested
+
+AUDIO_ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
 
 # Create Flask app instance
 app = Flask(__name__)
 
+request_duration = registry.histogram(
+    "news_http_request_duration_seconds", "Time to produce each API response", ["endpoint", "method", "status"]
+)
+
+@app.before_request
+def start_request_timer():
+    g.request_started_at = time.perf_counter()
+
+@app.after_request
+def record_request_duration(response):
+    # Streaming responses are timed until their first byte, not until the stream ends
+    started_at = g.pop('request_started_at', None)
+    if started_at is not None:
+        # Label by route pattern rather than path so IDs in URLs do not create new series
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_duration.observe(time.perf_counter() - started_at, endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+# Background workers for asynchronous news analysis jobs
+job_manager = JobManager(
+    max_workers=int(os.getenv("NEWS_JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("NEWS_JOB_QUEUE_SIZE", "100")),
+    result_ttl=float(os.getenv("NEWS_JOB_RESULT_TTL", "600"))
+)
+
+# Limits for /api/news/batch
+MAX_BATCH_COMPANIES = int(os.getenv("NEWS_BATCH_MAX_COMPANIES", "500"))
+BATCH_FETCH_CONCURRENCY = int(os.getenv("NEWS_BATCH_FETCH_CONCURRENCY", "16"))
+
+# Concurrent analyses of the same company share one in-flight computation
+coalesced_waits = registry.counter("news_coalesced_waits", "Analyses served by waiting for an identical in-flight analysis")
+news_flight = SingleFlight(on_coalesced=coalesced_waits.inc)
+
+def _job_counts():
+    stats = job_manager.stats()
+    return {(status,): stats[status] for status in ("queued", "running", "completed", "failed")}
+
+registry.gauge("news_jobs", "Background analysis jobs by status", ["status"], callback=_job_counts)
+
+def analyze_company(company_name):
+    """Fetch and analyze news articles for a company, joining an identical in-flight analysis if there is one"""
+    return news_flight.do(normalize_query(company_name), _analyze_company, company_name)
+
+def _analyze_company(company_name):
+    # Get news articles
+    news_articles = get_news_articles(company_name)
+    
+    # Process news articles
+    processed_data = process_news_articles(company_name, news_articles)
+    
+    record_history([processed_data])
+    
+    return processed_data
+
+# Optional store of every analysis, for history queries without rerunning the pipeline
+history_db = os.getenv("NEWS_HISTORY_DB")
+history_store = HistoryStore(history_db) if history_db else None
+
+def record_history(results):
+    """Record analysis results in the history store, if one is configured"""
+    if history_store is None or not results:
+        return
+    
+    try:
+        history_store.record_runs(results)
+    except Exception as e:
+        # History is best effort and must not fail the analysis itself
+        print(f"Error recording history: {str(e)}")
+
 @app.route('/api/news', methods=['POST'])
 def news_api():
     """API endpoint to fetch and analyze news articles for a given company"""
@@ -19,17 +101,140 @@ def news_api():
         if not company_name:
             return jsonify({'error': 'Company name is required'}), 400
         
-        # Get news articles
-        news_articles = get_news_articles(company_name)
+        if profiling_requested(request.headers.get('X-Profile')):
+            request_id = request.headers.get('X-Request-ID') or new_request_id()
+            
+            # Profile a run of this request's own rather than a wait on an identical in-flight one
+            with profile_run(company_name, request_id) as profile:
+                processed_data = _analyze_company(company_name)
+            
+            response = jsonify(processed_data)
+            if "Skipped" in profile:
+                response.headers['X-Profile-Skipped'] = profile['Skipped']
+            else:
+                response.headers['X-Profile-ID'] = profile['Request ID']
+            return response
         
-        # Process news articles
-        processed_data = process_news_articles(company_name, news_articles)
+        # Get and process news articles
+        processed_data = analyze_company(company_name)
         
         return jsonify(processed_data)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/news/batch', methods=['POST'])
+def news_batch_api():
+    """API endpoint to fetch and analyze news articles for many companies in one call"""
+    try:
+        data = request.json
+        companies = data.get('companies')
+        num_articles = data.get('num_articles', 10)
+        
+        if not isinstance(companies, list) or not companies or not all(isinstance(c, str) and c.strip() for c in companies):
+            return jsonify({'error': 'companies must be a non-empty list of company names'}), 400
+        
+        if len(companies) > MAX_BATCH_COMPANIES:
+            return jsonify({'error': f'At most {MAX_BATCH_COMPANIES} companies can be analyzed per call'}), 400
+        
+        if not isinstance(num_articles, int) or num_articles < 1:
+            return jsonify({'error': 'num_articles must be a positive integer'}), 400
+        
+        batch = process_news_batch(companies, num_articles=num_articles, max_concurrency=BATCH_FETCH_CONCURRENCY)
+        record_history(list(batch['Results'].values()))
+        
+        return jsonify({'results': batch['Results'], 'errors': batch['Errors']})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/news/stream', methods=['POST'])
+def news_stream_api():
+    """API endpoint that streams each analyzed article as soon as it is ready, then the comparative summary"""
+    try:
+        data = request.json
+        company_name = data.get('company_name')
+        
+        if not company_name:
+            return jsonify({'error': 'Company name is required'}), 400
+        
+        # Server-Sent Events when asked for, newline-delimited JSON otherwise
+        use_sse = data.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+        
+        def generate():
+            try:
+                news_articles = collapse_near_duplicates(get_news_articles(company_name))
+                
+                processed_articles = []
+                for index, article in enumerate(iter_processed_articles(news_articles)):
+                    processed_articles.append(article)
+                    yield format_stream_event('article', dict(article.to_dict(), Index=index), use_sse)
+                
+                comparative_analysis = perform_comparative_analysis(processed_articles)
+                yield format_stream_event('summary', {
+                    'Company': company_name,
+                    'Comparative Sentiment Score': comparative_analysis,
+                    'Final Sentiment Analysis': comparative_analysis['Final Sentiment Analysis']
+                }, use_sse)
+            
+            except Exception as e:
+                yield format_stream_event('error', {'error': str(e)}, use_sse)
+        
+        mimetype = 'text/event-stream' if use_sse else 'application/x-ndjson'
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        
+        return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def format_stream_event(event, payload, use_sse):
+    """Serialize one streaming event as an SSE message or an NDJSON line"""
+    if use_sse:
+        return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    
+    return json.dumps({'event': event, 'data': payload}, ensure_ascii=False) + "\n"
+
+@app.route('/api/news/jobs', methods=['POST'])
+def create_news_job():
+    """API endpoint to start a background news analysis job for a company"""
+    try:
+        data = request.json
+        company_name = data.get('company_name')
+        
+        if not company_name:
+            return jsonify({'error': 'Company name is required'}), 400
+        
+        try:
+            job_id = job_manager.submit(analyze_company, company_name)
+        except QueueFullError as e:
+            return jsonify({'error': str(e)}), 429
+        
+        status_url = url_for('news_job_status', job_id=job_id)
+        
+        return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': status_url}), 202, {'Location': status_url}
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/news/jobs/<job_id>', methods=['GET'])
+def news_job_status(job_id):
+    """API endpoint to get the status and, once finished, the result of a news analysis job"""
+    job = job_manager.get(job_id)
+    
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'result': job['result'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at']
+    })
+
 @app.route('/api/speech', methods=['POST'])
 def speech_api():
     """API endpoint to generate speech from processed news data"""
@@ -38,15 +243,43 @@ def speech_api():
         data = request.json
         processed_data = data.get('processed_data')
         language_choice = data.get('language_choice', '3')  # Default to English (3)
+        language_choices = data.get('language_choices')
         
         if not processed_data:
             return jsonify({'error': 'Processed data is required'}), 400
         
+        # Generate speech for several languages at once
+        if language_choices is not None:
+            if not isinstance(language_choices, list) or not language_choices:
+                return jsonify({'error': 'language_choices must be a non-empty list'}), 400
+            
+            try:
+                results = generate_speech_multi(processed_data, language_choices)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            languages = {}
+            for code, result in results.items():
+                audio_id = audio_cache.key(result['Summary'], code) if result['Error'] is None else None
+                languages[code] = {
+                    'audio_path': result['Audio'],
+                    'audio_id': audio_id,
+                    'audio_url': url_for('audio_api', audio_id=audio_id) if audio_id else None,
+                    'summary_text': result['Summary'],
+                    'language': result['Language'],
+                    'error': result['Error']
+                }
+            
+            return jsonify({'languages': languages})
+        
         # Generate speech
         audio_file, summary_text, language_name = generate_speech_for_analysis_api(processed_data, language_choice)
+        audio_id = audio_cache.key(summary_text, LANGUAGE_CODES[language_choice]["code"])
         
         return jsonify({
             'audio_path': audio_file,
+            'audio_id': audio_id,
+            'audio_url': url_for('audio_api', audio_id=audio_id),
             'summary_text': summary_text,
             'language': language_name
         })
@@ -54,6 +287,60 @@ def speech_api():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/history', methods=['GET'])
+def history_api():
+    """API endpoint to query recorded sentiment history for a company"""
+    if history_store is None:
+        return jsonify({'error': 'History is not enabled; set NEWS_HISTORY_DB'}), 404
+    
+    company_name = request.args.get('company')
+    if not company_name:
+        return jsonify({'error': 'company is required'}), 400
+    
+    try:
+        days = float(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({'error': 'days must be a number'}), 400
+    
+    return jsonify({
+        'company': company_name,
+        'days': days,
+        'sentiment_distribution': history_store.sentiment_distribution(company_name, days=days),
+        'daily': history_store.daily_distribution(company_name, days=days),
+        'runs': history_store.runs(company_name, days=days)
+    })
+
+@app.route('/api/stats', methods=['GET'])
+def stats_api():
+    """API endpoint exposing cache, job queue and request coalescing statistics"""
+    return jsonify({
+        'news_cache': get_news_cache_stats(),
+        'nlp_cache': get_nlp_cache_stats(),
+        'audio_cache': get_audio_cache_stats(),
+        'jobs': job_manager.stats(),
+        'coalescing': news_flight.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_api():
+    """Prometheus endpoint exposing stage timings, article and error counts, cache hit rates and request latencies"""
+    return Response(registry.render(), content_type=Registry.CONTENT_TYPE)
+
+@app.route('/api/audio/<audio_id>', methods=['GET'])
+def audio_api(audio_id):
+    """API endpoint to stream generated speech by its ID, with Range, ETag and Content-Length support"""
+    # Audio IDs are content hashes, which also keeps the lookup inside the speech cache
+    if not AUDIO_ID_PATTERN.match(audio_id):
+        return jsonify({'error': 'Invalid audio ID'}), 400
+    
+    audio_path = audio_cache.lookup(audio_id)
+    if audio_path is None:
+        return jsonify({'error': 'Audio not found'}), 404
+    
+    # send_file streams the file in chunks and answers Range and conditional requests.
+    # The content never changes for an ID, so the ID itself is a stable ETag and clients may cache it
+    return send_file(audio_path, mimetype='audio/mpeg', conditional=True, etag=audio_id, max_age=86400)
+
 def generate_speech_for_analysis_api(processed_data, language_choice):
     """Modified version of generate_speech_for_analysis that doesn't require user input"""
     from main import LANGUAGE_CODES, text_to_speech, translate_summary
@@ -74,21 +361,28 @@ def generate_speech_for_analysis_api(processed_data, language_choice):
 def summarize_news(company_name):
     """Get and analyze news for a company"""
     try:
-        # Get news articles
-        news_articles = get_news_articles(company_name)
+        # Get and process news articles
+        processed_data = analyze_company(company_name)
         
-        if not news_articles:
+        if not processed_data["Articles"]:
             return None
         
-        # Process news articles
-        processed_data = process_news_articles(company_name, news_articles)
-        
         return processed_data
     
     except Exception as e:
         print(f"Error in summarize_news: {str(e)}")
         return None
 
+def summarize_news_batch(companies):
+    """Get and analyze news for many companies in one batched pass"""
+    batch = process_news_batch(companies, max_concurrency=BATCH_FETCH_CONCURRENCY)
+    record_history(list(batch['Results'].values()))
+    
+    for company_name, error in batch['Errors'].items():
+        print(f"Error in summarize_news_batch for {company_name}: {error}")
+    
+    return batch['Results']
+
 def generate_speech(processed_data, language_choice):
     """Generate speech from processed data"""
     try:
@@ -111,4 +405,10 @@ def generate_speech(processed_data, language_choice):
 
 # Only run the Flask app if this file is executed directly
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    debug = True
+    
+    # Load models before serving so the first request does not pay for it. With the debug
+    # reloader the parent process only watches files, so only the serving child warms up
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        warmup()
+    app.run(host='0.0.0.0', port=5000, debug=debug)
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
 import requests
 from api import summarize_news, generate_speech
+from main import warmup
 import base64
 import os
 import tempfile
@@ -74,119 +75,155 @@ language_choice = st.selectbox("Language", options=list(language_options.values(
 # Map back to the key
 language_key = [k for k, v in language_options.items() if v == language_choice][0]
 
+# Seconds an analysis or audio summary is reused before news is fetched again
+ANALYSIS_CACHE_TTL = int(os.getenv("APP_ANALYSIS_CACHE_TTL", "600"))
+
+@st.cache_resource(show_spinner="Loading language models...")
+def load_models():
+    """Load the NLP models once per server process, shared by every session and rerun"""
+    return warmup()
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, show_spinner=False)
+def analyze_news(company_name):
+    """Fetch and analyze news for a company, reusing the result for ANALYSIS_CACHE_TTL seconds"""
+    news_data = summarize_news(company_name)
+    
+    # Raise rather than return, so failed analyses are not cached
+    if not news_data or not news_data.get("Articles"):
+        raise LookupError(f"No news articles found for {company_name}")
+    
+    return news_data
+
+@st.cache_data(ttl=ANALYSIS_CACHE_TTL, show_spinner=False)
+def synthesize_summary(news_data, language_key):
+    """Generate the spoken summary of an analysis in one language, returning (audio bytes, summary text)"""
+    audio_path, summary_text = generate_speech(news_data, language_key)
+    
+    with open(audio_path, "rb") as audio_file:
+        return audio_file.read(), summary_text
+
+load_models()
+
 # Search button
 if st.button("Analyze News", type="primary"):
     if company_name:
         with st.spinner(f"Fetching and analyzing news for {company_name}..."):
             try:
-                # Call the API to get news analysis
-                news_data = summarize_news(company_name)
-                
-                if news_data and "Articles" in news_data and len(news_data["Articles"]) > 0:
-                    st.success(f"Successfully analyzed {len(news_data['Articles'])} news articles for {company_name}")
-                    
-                    # Display company overview
-                    st.header(f"Analysis for {company_name}")
-                    
-                    # Create tabs for different sections
-                    tab1, tab2, tab3 = st.tabs(["Summary", "Detailed Analysis", "Articles"])
-                    
-                    with tab1:
-                        # Display sentiment distribution
-                        st.subheader("Sentiment Distribution")
-                        distribution = news_data["Comparative Sentiment Score"]["Sentiment Distribution"]
-                        
-                        # Calculate percentages
-                        total = sum(distribution.values())
-                        if total > 0:
-                            positive_pct = round(distribution["Positive"] / total * 100)
-                            negative_pct = round(distribution["Negative"] / total * 100)
-                            neutral_pct = round(distribution["Neutral"] / total * 100)
-                            
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Positive", f"{distribution['Positive']} ({positive_pct}%)")
-                            with col2:
-                                st.metric("Negative", f"{distribution['Negative']} ({negative_pct}%)")
-                            with col3:
-                                st.metric("Neutral", f"{distribution['Neutral']} ({neutral_pct}%)")
-                        
-                        # Display final sentiment analysis
-                        st.subheader("Overall Sentiment")
-                        st.markdown(f"**{news_data['Final Sentiment Analysis']}**")
-                        
-                        # Display common topics
-                        st.subheader("Main Topics")
-                        common_topics = news_data["Comparative Sentiment Score"]["Topic Overlap"]["Common Topics"]
-                        if common_topics:
-                            st.write(", ".join(common_topics[:5]))
-                        else:
-                            st.write("No common topics found across articles")
-                            
-                        # Generate audio for the selected language
-                        st.subheader(f"Audio Summary in {language_choice}")
-                        with st.spinner(f"Generating {language_choice} speech..."):
-                            audio_path, summary_text = generate_speech(news_data, language_key)
-                            
-                            # Display the summary text
-                            st.text_area("Summary Text", summary_text, height=200)
-                            
-                            # Display audio player
-                            with open(audio_path, "rb") as audio_file:
-                                audio_bytes = audio_file.read()
-                                st.audio(audio_bytes, format="audio/mp3")
-                                
-                                # Add download button for the audio
-                                st.download_button(
-                                    label=f"Download {language_choice} Audio",
-                                    data=audio_bytes,
-                                    file_name=f"{company_name}_summary_{language_choice.lower()}.mp3",
-                                    mime="audio/mp3"
-                                )
-                    
-                    with tab2:
-                        # Display comparative analysis
-                        st.subheader("Coverage Differences")
-                        for comparison in news_data["Comparative Sentiment Score"]["Coverage Differences"]:
-                            st.markdown(f"**{comparison['Comparison']}**")
-                            st.markdown(f"*Impact:* {comparison['Impact']}")
-                            st.markdown("---")
-                        
-                        # Display topic overlap
-                        st.subheader("Topic Analysis")
-                        topic_overlap = news_data["Comparative Sentiment Score"]["Topic Overlap"]
-                        
-                        # Common topics
-                        if topic_overlap["Common Topics"]:
-                            st.markdown("**Common Topics Across Articles:**")
-                            st.write(", ".join(topic_overlap["Common Topics"]))
-                        
-                        # Unique topics
-                        if "Unique Topics" in topic_overlap and topic_overlap["Unique Topics"]:
-                            st.markdown("**Unique Topics by Article:**")
-                            for article_id, topics in topic_overlap["Unique Topics"].items():
-                                if topics:
-                                    st.markdown(f"*{article_id}:* {', '.join(topics)}")
-                    
-                    with tab3:
-                        # Display individual articles
-                        st.subheader("Individual Article Analysis")
-                        
-                        for i, article in enumerate(news_data["Articles"], 1):
-                            with st.expander(f"Article {i}: {article['Title']}"):
-                                # Determine sentiment color
-                                sentiment_class = f"sentiment-{article['Sentiment'].lower()}"
-                                
-                                st.markdown(f"**Summary:** {article['Summary']}")
-                                st.markdown(f"**Sentiment:** <span class='{sentiment_class}'>{article['Sentiment']}</span>", unsafe_allow_html=True)
-                                st.markdown(f"**Topics:** {', '.join(article['Topics'])}")
-                else:
-                    st.error(f"No news articles found for {company_name} or analysis failed.")
+                # Keep the analysis across reruns, so changing only the language does not analyze again
+                st.session_state["analysis"] = {"company": company_name, "data": analyze_news(company_name)}
+            except LookupError:
+                st.session_state.pop("analysis", None)
+                st.error(f"No news articles found for {company_name} or analysis failed.")
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
     else:
         st.warning("Please enter a company name to analyze.")
 
+analysis = st.session_state.get("analysis")
+
+if analysis:
+    analyzed_company = analysis["company"]
+    news_data = analysis["data"]
+    
+    st.success(f"Successfully analyzed {len(news_data['Articles'])} news articles for {analyzed_company}")
+    
+    # Display company overview
+    st.header(f"Analysis for {analyzed_company}")
+    
+    # Create tabs for different sections
+    tab1, tab2, tab3 = st.tabs(["Summary", "Detailed Analysis", "Articles"])
+    
+    with tab1:
+        # Display sentiment distribution
+        st.subheader("Sentiment Distribution")
+        distribution = news_data["Comparative Sentiment Score"]["Sentiment Distribution"]
+        
+        # Calculate percentages
+        total = sum(distribution.values())
+        if total > 0:
+            positive_pct = round(distribution["Positive"] / total * 100)
+            negative_pct = round(distribution["Negative"] / total * 100)
+            neutral_pct = round(distribution["Neutral"] / total * 100)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Positive", f"{distribution['Positive']} ({positive_pct}%)")
+            with col2:
+                st.metric("Negative", f"{distribution['Negative']} ({negative_pct}%)")
+            with col3:
+                st.metric("Neutral", f"{distribution['Neutral']} ({neutral_pct}%)")
+        
+        # Display final sentiment analysis
+        st.subheader("Overall Sentiment")
+        st.markdown(f"**{news_data['Final Sentiment Analysis']}**")
+        
+        # Display common topics
+        st.subheader("Main Topics")
+        common_topics = news_data["Comparative Sentiment Score"]["Topic Overlap"]["Common Topics"]
+        if common_topics:
+            st.write(", ".join(common_topics[:5]))
+        else:
+            st.write("No common topics found across articles")
+            
+        # Generate audio only for the selected language; each language is synthesized once per analysis
+        st.subheader(f"Audio Summary in {language_choice}")
+        try:
+            with st.spinner(f"Generating {language_choice} speech..."):
+                audio_bytes, summary_text = synthesize_summary(news_data, language_key)
+            
+            # Display the summary text
+            st.text_area("Summary Text", summary_text, height=200)
+            
+            # Display audio player
+            st.audio(audio_bytes, format="audio/mp3")
+            
+            # Add download button for the audio
+            st.download_button(
+                label=f"Download {language_choice} Audio",
+                data=audio_bytes,
+                file_name=f"{analyzed_company}_summary_{language_choice.lower()}.mp3",
+                mime="audio/mp3"
+            )
+        except Exception as e:
+            st.error(f"Could not generate {language_choice} speech: {str(e)}")
+    
+    with tab2:
+        # Display comparative analysis
+        st.subheader("Coverage Differences")
+        for comparison in news_data["Comparative Sentiment Score"]["Coverage Differences"]:
+            st.markdown(f"**{comparison['Comparison']}**")
+            st.markdown(f"*Impact:* {comparison['Impact']}")
+            st.markdown("---")
+        
+        # Display topic overlap
+        st.subheader("Topic Analysis")
+        topic_overlap = news_data["Comparative Sentiment Score"]["Topic Overlap"]
+        
+        # Common topics
+        if topic_overlap["Common Topics"]:
+            st.markdown("**Common Topics Across Articles:**")
+            st.write(", ".join(topic_overlap["Common Topics"]))
+        
+        # Unique topics
+        if "Unique Topics" in topic_overlap and topic_overlap["Unique Topics"]:
+            st.markdown("**Unique Topics by Article:**")
+            for article_id, topics in topic_overlap["Unique Topics"].items():
+                if topics:
+                    st.markdown(f"*{article_id}:* {', '.join(topics)}")
+    
+    with tab3:
+        # Display individual articles
+        st.subheader("Individual Article Analysis")
+        
+        for i, article in enumerate(news_data["Articles"], 1):
+            with st.expander(f"Article {i}: {article['Title']}"):
+                # Determine sentiment color
+                sentiment_class = f"sentiment-{article['Sentiment'].lower()}"
+                
+                st.markdown(f"**Summary:** {article['Summary']}")
+                st.markdown(f"**Sentiment:** <span class='{sentiment_class}'>{article['Sentiment']}</span>", unsafe_allow_html=True)
+                st.markdown(f"**Topics:** {', '.join(article['Topics'])}")
+
 # Add information about the app
 with st.sidebar:
     st.header("About this App")
@@ -0,0 +1,61 @@
+"""
+Measure how long a fresh interpreter takes to import main, and to warm it up
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--warmup]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+WARMUP_SNIPPET = """
+import time
+import main
+start = time.perf_counter()
+main.warmup()
+print(time.perf_counter() - start)
+"""
+
+def measure(snippet, runs):
+    """
+    Run a timing snippet in fresh interpreters
+
+    Parameters:
+    snippet (str): Python code that prints one duration in seconds
+    runs (int): Number of interpreters to start
+
+    Returns:
+    list: Measured durations in seconds
+    """
+    durations = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", snippet], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout
+        durations.append(float(output.strip().splitlines()[-1]))
+    return durations
+
+def report(label, durations):
+    print(f"{label:<12} median {statistics.median(durations) * 1000:8.1f} ms   min {min(durations) * 1000:8.1f} ms   max {max(durations) * 1000:8.1f} ms")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark cold import time of main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--warmup", action="store_true", help="Also time main.warmup(), which loads all models")
+    args = parser.parse_args()
+
+    report("import main", measure(IMPORT_SNIPPET, args.runs))
+    if args.warmup:
+        report("warmup()", measure(WARMUP_SNIPPET, args.runs))
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,63 @@
+"""
+Benchmark full vs fast parsing of saved news search result pages
+
+Usage:
+    python benchmarks/bench_parsing.py [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def time_parse(html, fast, repeat):
+    """
+    Time repeated parsing of one page
+
+    Parameters:
+    html (str): Page HTML
+    fast (bool): Whether to use the fast parsing mode
+    repeat (int): Number of parses
+
+    Returns:
+    float: Mean milliseconds per parse
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        main.parse_news_cards(html, fast=fast)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark news search page parsing")
+    parser.add_argument("--repeat", type=int, default=20, help="Parses per page and mode")
+    args = parser.parse_args()
+
+    print(f"Fast parser backend: {main.FAST_HTML_PARSER}")
+    print(f"{'Fixture':<28} {'Cards':>5} {'Full ms':>9} {'Fast ms':>9} {'Speedup':>8}")
+
+    mismatches = 0
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        # Both modes must produce exactly the same records
+        full_cards = main.parse_news_cards(html)
+        fast_cards = main.parse_news_cards(html, fast=True)
+        if full_cards != fast_cards:
+            mismatches += 1
+            print(f"MISMATCH: {os.path.basename(path)} parses differently in fast mode")
+
+        full_ms = time_parse(html, False, args.repeat)
+        fast_ms = time_parse(html, True, args.repeat)
+        print(f"{os.path.basename(path):<28} {len(full_cards):>5} {full_ms:>9.2f} {fast_ms:>9.2f} {full_ms / fast_ms:>7.1f}x")
+
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
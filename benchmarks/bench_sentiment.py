@@ -0,0 +1,117 @@
+"""
+Check that sentiment backends agree with the combined TextBlob and VADER backend, and time them
+
+Texts come from a corpus of news sentences, the summaries on the saved search
+result pages and the synthetic benchmark corpus. The script exits with status 1
+if any backend's label agreement falls below --min-agreement.
+
+Usage:
+    python benchmarks/bench_sentiment.py [--backends lexicon] [--synthetic 5000]
+                                         [--repeat N] [--min-agreement 0.99]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from run import FIXTURES_DIR, load_fixture_pages, synthetic_articles
+from sentiment_backends import BACKENDS, CombinedBackend, get_sentiment_backend
+
+def load_corpus(synthetic_size):
+    """
+    Collect the texts to score
+
+    Parameters:
+    synthetic_size (int): Number of synthetic article summaries to add
+
+    Returns:
+    list: Texts
+    """
+    with open(os.path.join(FIXTURES_DIR, "sentiment_corpus.txt"), 'r', encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip()]
+
+    for page in load_fixture_pages():
+        texts.extend(card["Summary"] for card in main.parse_news_cards(page))
+
+    texts.extend(article["Summary"] for article in synthetic_articles(synthetic_size))
+    return texts
+
+def time_backend(backend, texts, repeat):
+    """
+    Time scoring the whole corpus
+
+    Parameters:
+    backend (SentimentBackend): Loaded backend
+    texts (list): Texts to score
+    repeat (int): Number of timed runs
+
+    Returns:
+    float: Median seconds per run
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.analyze(texts)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+def main_cli():
+    candidates = [name for name in BACKENDS if name != CombinedBackend.name]
+
+    parser = argparse.ArgumentParser(description="Compare sentiment backends against the combined backend")
+    parser.add_argument("--backends", default=",".join(candidates), help="Comma-separated backends to check")
+    parser.add_argument("--synthetic", type=int, default=5000, help="Synthetic article summaries to add to the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per backend")
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="Lowest acceptable fraction of matching labels")
+    args = parser.parse_args()
+
+    names = [name for name in args.backends.split(",") if name]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(unknown)} (choose from {', '.join(BACKENDS)})")
+
+    texts = load_corpus(args.synthetic)
+
+    reference = get_sentiment_backend(CombinedBackend.name)
+    reference.load()
+    expected = reference.analyze(texts)
+    reference_seconds = time_backend(reference, texts, args.repeat)
+
+    print(f"{len(texts)} texts, {CombinedBackend.name} backend: {reference_seconds * 1000:.1f} ms")
+    print(f"{'Backend':<10} {'Agreement':>10} {'Polarity MAE':>13} {'Compound MAE':>13} {'Median ms':>10} {'Speedup':>8}")
+
+    failures = 0
+    for name in names:
+        backend = get_sentiment_backend(name)
+        backend.load()
+        results = backend.analyze(texts)
+
+        agreement = sum(result["Sentiment"] == reference_result["Sentiment"]
+                        for result, reference_result in zip(results, expected)) / len(texts)
+        polarity_error = statistics.mean(abs(result["Polarity"] - reference_result["Polarity"])
+                                         for result, reference_result in zip(results, expected))
+        compound_error = statistics.mean(abs(result["Compound"] - reference_result["Compound"])
+                                         for result, reference_result in zip(results, expected))
+        seconds = time_backend(backend, texts, args.repeat)
+
+        print(f"{name:<10} {agreement:>10.2%} {polarity_error:>13.6f} {compound_error:>13.6f} {seconds * 1000:>10.1f} {reference_seconds / seconds:>7.1f}x")
+
+        # Show a few disagreements to make a drop in agreement easy to investigate
+        shown = 0
+        for text, result, reference_result in zip(texts, results, expected):
+            if result["Sentiment"] != reference_result["Sentiment"] and shown < 5:
+                print(f"  {reference_result['Sentiment']} -> {result['Sentiment']}: {text[:100]}")
+                shown += 1
+
+        if agreement < args.min_agreement:
+            failures += 1
+            print(f"  agreement below {args.min_agreement:.0%}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,109 @@
+"""
+Compare the keyword topic mode against the SpaCy topic mode
+
+Both modes extract topics from the news sentences in the sentiment fixture
+corpus, the summaries on the saved search result pages and the synthetic
+benchmark corpus. The script reports the throughput of each mode and how far
+the keyword topics overlap the SpaCy topics. Without the SpaCy model only the
+keyword mode is timed, since the run never downloads anything.
+
+Usage:
+    python benchmarks/bench_topics.py [--synthetic 2000] [--repeat N] [--show 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from bench_sentiment import load_corpus
+from run import topics_unavailable
+
+def time_mode(mode, texts, repeat):
+    """
+    Time topic extraction for the whole corpus
+
+    Parameters:
+    mode (str): Topic mode
+    texts (list): Texts to analyze
+    repeat (int): Number of timed runs, after one untimed warm-up run
+
+    Returns:
+    tuple: (topic lists, median seconds per run)
+    """
+    topics = main.extract_topics_batch(texts, mode=mode)
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        main.extract_topics_batch(texts, mode=mode)
+        durations.append(time.perf_counter() - start)
+    return topics, statistics.median(durations)
+
+def overlap(keyword_topics, spacy_topics):
+    """
+    Measure how closely keyword topics match SpaCy topics for one text
+
+    Topics count as matching when they are equal ignoring case, or when one
+    contains the other ("Tesla" and "Tesla Motors").
+
+    Parameters:
+    keyword_topics (list): Topics from the keyword mode
+    spacy_topics (list): Topics from the SpaCy mode
+
+    Returns:
+    tuple: (fraction of SpaCy topics matched by a keyword topic, Jaccard similarity of the exact topic sets)
+    """
+    keyword_lower = [topic.lower() for topic in keyword_topics]
+    spacy_lower = [topic.lower() for topic in spacy_topics]
+
+    if not spacy_lower:
+        recall = 1.0 if not keyword_lower else 0.0
+    else:
+        matched = sum(any(topic in other or other in topic for other in keyword_lower) for topic in spacy_lower)
+        recall = matched / len(spacy_lower)
+
+    union = set(keyword_lower) | set(spacy_lower)
+    jaccard = len(set(keyword_lower) & set(spacy_lower)) / len(union) if union else 1.0
+    return recall, jaccard
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Compare keyword and SpaCy topic extraction")
+    parser.add_argument("--synthetic", type=int, default=2000, help="Synthetic article summaries to add to the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per mode")
+    parser.add_argument("--show", type=int, default=10, help="Number of texts whose topics are printed side by side")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.synthetic)
+
+    keyword_topics, keyword_seconds = time_mode("keywords", texts, args.repeat)
+    print(f"{len(texts)} texts")
+    print(f"{'Mode':<10} {'Median ms':>10} {'Texts/s':>10}")
+    print(f"{'keywords':<10} {keyword_seconds * 1000:>10.1f} {len(texts) / keyword_seconds:>10.0f}")
+
+    reason = topics_unavailable()
+    if reason:
+        print(f"{'spacy':<10} skipped: {reason}")
+        for text, topics in list(zip(texts, keyword_topics))[:args.show]:
+            print(f"\n{text[:100]}\n  keywords: {topics}")
+        return 0
+
+    spacy_topics, spacy_seconds = time_mode("spacy", texts, args.repeat)
+    print(f"{'spacy':<10} {spacy_seconds * 1000:>10.1f} {len(texts) / spacy_seconds:>10.0f}")
+    print(f"Keyword mode speedup: {spacy_seconds / keyword_seconds:.1f}x")
+
+    scores = [overlap(keywords, topics) for keywords, topics in zip(keyword_topics, spacy_topics)]
+    print(f"SpaCy topics matched by a keyword topic: {statistics.mean(recall for recall, _ in scores):.1%}")
+    print(f"Mean Jaccard similarity of exact topics: {statistics.mean(jaccard for _, jaccard in scores):.1%}")
+    print(f"Texts with at least one shared topic: {sum(recall > 0 for recall, _ in scores) / len(scores):.1%}")
+
+    for text, keywords, topics in list(zip(texts, keyword_topics, spacy_topics))[:args.show]:
+        print(f"\n{text[:100]}\n  spacy:    {topics}\n  keywords: {keywords}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
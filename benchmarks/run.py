@@ -0,0 +1,327 @@
+"""
+Offline stage-level benchmarks for the news analysis pipeline
+
+Each stage runs against saved search result pages or a synthetic article
+corpus at several sizes, and reports latency and throughput. Results can be
+saved as JSON and compared against a previous run to catch regressions.
+
+Usage:
+    python benchmarks/run.py [--sizes 10,100,1000,10000] [--stages sentiment,topics,...]
+                             [--repeat N] [--output results.json]
+                             [--compare previous.json] [--threshold 0.15] [--min-ms 1.0]
+"""
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from records import ProcessedArticle, Sentiment
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+COMPANIES = ["Tesla", "Apple", "Microsoft", "Amazon", "Google", "Nvidia", "Meta", "Intel"]
+
+SUBJECTS = [
+    "quarterly earnings", "the new product line", "its supply chain", "the board", "regulators",
+    "the electric vehicle market", "cloud revenue", "the chip shortage", "its AI strategy", "employees"
+]
+
+POSITIVE_PHRASES = [
+    "shares jumped after strong results", "analysts praised the outlook", "sales beat expectations",
+    "investors welcomed the announcement", "profits rose to a record high"
+]
+
+NEGATIVE_PHRASES = [
+    "shares fell sharply after weak guidance", "the company faces a lawsuit", "a recall hit production",
+    "regulators opened an investigation", "losses widened more than expected"
+]
+
+NEUTRAL_PHRASES = [
+    "the company will report results next week", "executives met with partners in Berlin",
+    "the meeting is scheduled for Tuesday", "a spokesperson declined to comment", "the filing was published on Monday"
+]
+
+def synthetic_articles(size, seed=0):
+    """
+    Build a deterministic synthetic corpus of fetched articles
+
+    Parameters:
+    size (int): Number of articles
+    seed (int): Random seed
+
+    Returns:
+    list: Article dicts with "Title", "Link" and "Summary" keys
+    """
+    rng = random.Random(seed)
+    articles = []
+
+    for index in range(size):
+        company = rng.choice(COMPANIES)
+        subject = rng.choice(SUBJECTS)
+        phrases = rng.choice((POSITIVE_PHRASES, NEGATIVE_PHRASES, NEUTRAL_PHRASES))
+        summary = f"{company} and {subject}: {rng.choice(phrases)}, while {rng.choice(phrases)}. Report {index}."
+        articles.append({
+            "Title": f"{company} {rng.choice(phrases)}",
+            "Link": f"https://example.com/news/{index}",
+            "Summary": summary
+        })
+
+    return articles
+
+def synthetic_processed_articles(size, seed=0):
+    """
+    Build a deterministic synthetic corpus of analyzed articles
+
+    Topics are drawn from a skewed pool so a few topics are shared widely and
+    most are rare, as in real coverage.
+
+    Parameters:
+    size (int): Number of articles
+    seed (int): Random seed
+
+    Returns:
+    list: ProcessedArticle records
+    """
+    rng = random.Random(seed)
+    topic_pool = COMPANIES + [subject.title() for subject in SUBJECTS] + [f"Topic {index}" for index in range(max(size // 2, 1))]
+    weights = [1 / (rank + 1) for rank in range(len(topic_pool))]
+    articles = []
+
+    for index in range(size):
+        topics = list(dict.fromkeys(rng.choices(topic_pool, weights, k=3)))
+        sentiment = rng.choice(list(Sentiment))
+        articles.append(ProcessedArticle(f"Headline {index}", f"Summary {index}", sentiment, topics))
+
+    return articles
+
+def load_fixture_pages():
+    """
+    Read the saved search result pages
+
+    Returns:
+    list: Page HTML strings
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+def prepare_parse(size):
+    # Cycle through the saved pages until they hold at least size cards
+    fast = main.NEWS_PARSE_MODE == "fast"
+    pages = load_fixture_pages()
+    workload = []
+    cards = 0
+    while cards < size:
+        page = pages[len(workload) % len(pages)]
+        workload.append(page)
+        cards += len(main.parse_news_cards(page, fast=fast))
+
+    def run():
+        for page in workload:
+            main.parse_news_cards(page, fast=fast)
+
+    return run, cards
+
+def prepare_sentiment(size):
+    # Call the analyzers directly so the NLP result cache does not hide the work
+    summaries = [article["Summary"] for article in synthetic_articles(size)]
+    return (lambda: main.analyze_sentiment_batch(summaries)), size
+
+def prepare_topics(size):
+    summaries = [article["Summary"] for article in synthetic_articles(size)]
+    return (lambda: main.extract_topics_batch(summaries, mode="spacy")), size
+
+def prepare_keywords(size):
+    summaries = [article["Summary"] for article in synthetic_articles(size)]
+    return (lambda: main.extract_topics_batch(summaries, mode="keywords")), size
+
+def prepare_comparative(size):
+    articles = synthetic_processed_articles(size)
+    return (lambda: main.perform_comparative_analysis(articles)), size
+
+def prepare_translate(size):
+    # Produce size summaries, cycling through the languages
+    processed_data = main.build_news_output("Benchmark", synthetic_processed_articles(min(size, 100)))
+    language_codes = [language["code"] for language in main.LANGUAGE_CODES.values()]
+    workload = [language_codes[index % len(language_codes)] for index in range(size)]
+
+    def run():
+        for language_code in workload:
+            main.translate_summary(processed_data, language_code)
+
+    return run, size
+
+def prepare_dedup(size):
+    articles = synthetic_articles(size)
+    return (lambda: main.collapse_near_duplicates(articles)), size
+
+def topics_unavailable():
+    # Loading a missing model would try to download it, which an offline run must not do
+    if importlib.util.find_spec(main.SPACY_MODEL) is None:
+        return f"spaCy model {main.SPACY_MODEL} is not installed"
+    return None
+
+# Stage name -> (prepare function, reason-it-cannot-run check or None)
+STAGES = {
+    "parse": (prepare_parse, None),
+    "sentiment": (prepare_sentiment, None),
+    "topics": (prepare_topics, topics_unavailable),
+    "keywords": (prepare_keywords, None),
+    "comparative": (prepare_comparative, None),
+    "translate": (prepare_translate, None),
+    "dedup": (prepare_dedup, None),
+}
+
+def measure(run, items, repeat):
+    """
+    Time a prepared workload
+
+    Parameters:
+    run (callable): Workload to time
+    items (int): Number of items the workload processes
+    repeat (int): Number of timed runs, after one untimed warm-up run
+
+    Returns:
+    dict: Latency in milliseconds and throughput in items per second
+    """
+    run()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+
+    median = statistics.median(durations)
+    return {
+        "items": items,
+        "runs": repeat,
+        "median_ms": median * 1000,
+        "min_ms": min(durations) * 1000,
+        "max_ms": max(durations) * 1000,
+        "items_per_second": items / median if median else None
+    }
+
+def run_benchmarks(stages, sizes, repeat):
+    """
+    Run the selected stages at every size
+
+    Parameters:
+    stages (list): Stage names from STAGES
+    sizes (list): Corpus sizes
+    repeat (int): Timed runs per stage and size
+
+    Returns:
+    dict: Stage -> size (as a string) -> measurement, or {"skipped": reason} for stages that cannot run
+    """
+    results = {}
+
+    for stage in stages:
+        prepare, unavailable = STAGES[stage]
+        reason = unavailable() if unavailable else None
+        if reason:
+            results[stage] = {"skipped": reason}
+            print(f"{stage:<12} skipped: {reason}")
+            continue
+
+        results[stage] = {}
+        for size in sizes:
+            run, items = prepare(size)
+            measurement = measure(run, items, repeat)
+            results[stage][str(size)] = measurement
+            print(f"{stage:<12} {size:>7} {measurement['median_ms']:>11.2f} ms {measurement['items_per_second']:>13.0f} items/s")
+
+    return results
+
+def compare(current, previous, threshold, min_ms=1.0):
+    """
+    Compare median latencies against a previous run
+
+    Parameters:
+    current (dict): Results of this run
+    previous (dict): Results of the previous run
+    threshold (float): Relative slowdown that counts as a regression, e.g. 0.15 for 15%
+    min_ms (float): Measurements faster than this are too noisy to count as regressions
+
+    Returns:
+    list: (stage, size, previous_ms, current_ms) for every regression
+    """
+    regressions = []
+
+    print(f"\n{'Stage':<12} {'Size':>7} {'Before ms':>11} {'After ms':>11} {'Change':>8}")
+    for stage, sizes in current.items():
+        for size, measurement in sizes.items():
+            before = previous.get(stage, {}).get(size)
+            if not isinstance(measurement, dict) or not isinstance(before, dict):
+                continue
+
+            change = measurement["median_ms"] / before["median_ms"] - 1
+            regressed = change > threshold and max(measurement["median_ms"], before["median_ms"]) >= min_ms
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{stage:<12} {size:>7} {before['median_ms']:>11.2f} {measurement['median_ms']:>11.2f} {change:>+7.1%}{flag}")
+
+            if regressed:
+                regressions.append((stage, size, before["median_ms"], measurement["median_ms"]))
+
+    return regressions
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parse_mode": main.NEWS_PARSE_MODE,
+        "html_parser": main.FAST_HTML_PARSER,
+        "nlp_version": main.NLP_CACHE_VERSION
+    }
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Run offline stage-level benchmarks")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Comma-separated corpus sizes")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage and size")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Previous results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown reported as a regression")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Ignore regressions in measurements faster than this")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+
+    print(f"{'Stage':<12} {'Size':>7} {'Median':>14} {'Throughput':>21}")
+    results = run_benchmarks(stages, sizes, args.repeat)
+
+    if args.output:
+        report = {"created_at": time.time(), "environment": environment(), "repeat": args.repeat, "results": results}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = compare(results, previous["results"], args.threshold, args.min_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,549 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+def atomic_write(path, write):
+    """
+    Write a file atomically by writing a temporary file next to it and renaming it into place
+
+    Parameters:
+    path (str): Destination path
+    write (callable): Called with a binary file object to produce the content
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def normalize_query(query):
+    """
+    Normalize a search query or company name for use as a cache or storage key
+
+    Parameters:
+    query (str): Search query
+
+    Returns:
+    str: Lowercased query with collapsed whitespace
+    """
+    return " ".join(query.split()).lower()
+
+def sqlite_connection(local, db_path):
+    """
+    Get the calling thread's connection to a SQLite database, opening it on first use
+
+    SQLite connections must not be shared across threads or forked processes,
+    so each thread keeps its own connection in local and reopens it after a
+    fork. Connections use WAL journaling so readers never block the writer.
+
+    Parameters:
+    local (threading.local): Per-thread storage owned by the caller
+    db_path (str): SQLite database file
+
+    Returns:
+    sqlite3.Connection: The connection
+    """
+    connection = getattr(local, "connection", None)
+    if connection is None or local.pid != os.getpid():
+        connection = sqlite3.connect(db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        local.connection = connection
+        local.pid = os.getpid()
+    return connection
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with per-entry expiry and LRU eviction
+
+    Entries can optionally be persisted as JSON files in a directory so a
+    restarted process starts with a warm cache. Keys and values must then be
+    JSON serializable.
+    """
+
+    def __init__(self, maxsize=256, ttl=600, persist_dir=None):
+        """
+        Parameters:
+        maxsize (int): Maximum number of entries kept in memory
+        ttl (float, optional): Seconds an entry stays valid, None to never expire
+        persist_dir (str, optional): Directory for persisted entries, None to keep everything in memory
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.persist_dir = persist_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, value), least recently used first
+        self._lock = threading.Lock()
+
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def get(self, key, default=None):
+        """
+        Get a cached value, counting a hit or a miss
+
+        Parameters:
+        key: Cache key
+        default: Value returned on a miss
+
+        Returns:
+        The cached value, or default if missing or expired
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[0], now):
+                del self._entries[key]
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        # Fall back to the persisted copy, if any
+        entry = self._read_persisted(key, now)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._store(key, entry)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the least recently used entries if the cache is full
+
+        Parameters:
+        key: Cache key
+        value: Value to store
+        """
+        entry = (time.time(), value)
+
+        with self._lock:
+            self._store(key, entry)
+
+        self._write_persisted(key, entry)
+
+    def clear(self):
+        """Remove all entries, including persisted ones, and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+        if self.persist_dir:
+            for filename in os.listdir(self.persist_dir):
+                if filename.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.persist_dir, filename))
+                    except OSError:
+                        pass
+
+    def stats(self):
+        """
+        Get hit/miss counters and occupancy
+
+        Returns:
+        dict: Cache statistics
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _is_expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _store(self, key, entry):
+        # Caller must hold the lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _persisted_path(self, key):
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.json")
+
+    def _read_persisted(self, key, now):
+        if not self.persist_dir:
+            return None
+
+        path = self._persisted_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self._is_expired(record["stored_at"], now):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        return record["stored_at"], record["value"]
+
+    def _write_persisted(self, key, entry):
+        if not self.persist_dir:
+            return
+
+        # Write to a temporary file first so readers never see a partial entry
+        try:
+            record = json.dumps({"stored_at": entry[0], "value": entry[1]}, ensure_ascii=False).encode("utf-8")
+            atomic_write(self._persisted_path(key), lambda f: f.write(record))
+        except (OSError, TypeError, ValueError):
+            pass
+
+class NLPResultCache:
+    """
+    Content-addressed cache for per-text NLP results
+
+    Results are keyed on a hash of the text and an analyzer/model version
+    string, so identical summaries seen under different companies are only
+    analyzed once. An in-memory LRU tier sits in front of an optional SQLite
+    tier that several worker processes can share. Rows older than db_ttl and
+    the oldest rows beyond db_max_rows are deleted when the cache opens and
+    then at most every prune_interval seconds while results are stored, so
+    the database does not grow without bound.
+    """
+
+    def __init__(self, version, maxsize=10000, db_path=None, db_ttl=None, db_max_rows=None, prune_interval=3600):
+        """
+        Parameters:
+        version (str): Analyzer/model version; changing it invalidates all entries
+        maxsize (int): Maximum number of results kept in memory
+        db_path (str, optional): SQLite database file for the shared tier, None for memory only
+        db_ttl (float, optional): Seconds a stored result stays valid, None to keep results until evicted by size
+        db_max_rows (int, optional): Maximum number of stored results, None for no limit
+        prune_interval (float): Minimum seconds between prunes of the SQLite tier
+        """
+        self.version = version
+        self.db_path = db_path
+        self.db_ttl = db_ttl
+        self.db_max_rows = db_max_rows
+        self.prune_interval = prune_interval
+        self.memory = TTLCache(maxsize=maxsize, ttl=None)
+        self.disk_hits = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._last_prune = 0.0
+
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS nlp_results (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS nlp_results_created_at ON nlp_results (created_at)")
+            self.prune()
+
+    def key(self, text):
+        """
+        Get the content-addressed key for a text
+
+        Parameters:
+        text (str): Analyzed text
+
+        Returns:
+        str: Hex digest of the version and text
+        """
+        return hashlib.sha256(f"{self.version}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts):
+        """
+        Look up cached results for several texts
+
+        Parameters:
+        texts (list): Texts to look up
+
+        Returns:
+        dict: Text -> cached result for every text that was found
+        """
+        found = {}
+        missing = {}
+
+        for text in dict.fromkeys(texts):
+            key = self.key(text)
+            result = self.memory.get(key)
+            if result is not None:
+                found[text] = result
+            else:
+                missing[key] = text
+
+        if missing and self.db_path:
+            rows = self._select(list(missing))
+            for key, value in rows:
+                result = json.loads(value)
+                found[missing[key]] = result
+                self.memory.set(key, result)
+
+            with self._stats_lock:
+                self.disk_hits += len(rows)
+
+        return found
+
+    def set_many(self, results):
+        """
+        Store results for several texts in both tiers
+
+        Parameters:
+        results (dict): Text -> JSON-serializable result
+        """
+        rows = []
+        now = time.time()
+
+        for text, result in results.items():
+            key = self.key(text)
+            self.memory.set(key, result)
+            rows.append((key, json.dumps(result, ensure_ascii=False), now))
+
+        if rows and self.db_path:
+            connection = self._connection()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO nlp_results (key, value, created_at) VALUES (?, ?, ?)", rows)
+
+            if now - self._last_prune >= self.prune_interval:
+                self.prune()
+
+    def prune(self):
+        """
+        Delete expired rows and the oldest rows beyond db_max_rows from the SQLite tier
+
+        Returns:
+        int: Number of rows deleted
+        """
+        if not self.db_path:
+            return 0
+
+        self._last_prune = time.time()
+        deleted = 0
+        connection = self._connection()
+        with connection:
+            if self.db_ttl is not None:
+                deleted += connection.execute("DELETE FROM nlp_results WHERE created_at < ?", (self._last_prune - self.db_ttl,)).rowcount
+            if self.db_max_rows is not None:
+                deleted += connection.execute(
+                    "DELETE FROM nlp_results WHERE key IN (SELECT key FROM nlp_results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.db_max_rows,)
+                ).rowcount
+        return deleted
+
+    def stats(self):
+        """
+        Get hit/miss counters for both tiers
+
+        Returns:
+        dict: Cache statistics
+        """
+        memory_stats = self.memory.stats()
+        with self._stats_lock:
+            disk_hits = self.disk_hits
+
+        # Every memory miss either hit the disk tier or needed fresh NLP work
+        return {
+            "memory_hits": memory_stats["hits"],
+            "disk_hits": disk_hits,
+            "misses": memory_stats["misses"] - disk_hits,
+            "size": memory_stats["size"],
+            "maxsize": memory_stats["maxsize"],
+            "persistent": bool(self.db_path)
+        }
+
+    def _connection(self):
+        return sqlite_connection(self._local, self.db_path)
+
+    def _select(self, keys):
+        connection = self._connection()
+        rows = []
+
+        # Rows expire on read too, so results past db_ttl are not served before the next prune
+        oldest = time.time() - self.db_ttl if self.db_ttl is not None else float("-inf")
+
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(connection.execute(
+                f"SELECT key, value FROM nlp_results WHERE key IN ({placeholders}) AND created_at >= ?", chunk + [oldest]
+            ).fetchall())
+
+        return rows
+
+class AudioCache:
+    """
+    Size-bounded directory of synthesized audio keyed on a hash of (text, language)
+
+    Files are written atomically, so concurrent requests never see or
+    overwrite each other's partial output. When the directory grows past
+    max_bytes the least recently used files are removed.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, extension=".mp3"):
+        """
+        Parameters:
+        directory (str): Directory holding the cached files
+        max_bytes (int): Maximum total size of the cached files
+        extension (str): File extension of the cached files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._eviction_lock = threading.Lock()
+        # Striped locks so concurrent requests for the same audio synthesize it only once
+        self._key_locks = [threading.Lock() for _ in range(64)]
+
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, text, language_code):
+        """
+        Get the content-addressed key for a text and language
+
+        Parameters:
+        text (str): Text to synthesize
+        language_code (str): Language code
+
+        Returns:
+        str: Hex digest identifying the audio
+        """
+        return hashlib.sha256(f"{language_code}\0{text}".encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        """
+        Get the file path for a key
+
+        Parameters:
+        key (str): Audio key
+
+        Returns:
+        str: Path of the cached file (which may not exist)
+        """
+        return os.path.join(self.directory, f"{key}{self.extension}")
+
+    def lookup(self, key):
+        """
+        Get the path of a cached file without creating it
+
+        Parameters:
+        key (str): Audio key
+
+        Returns:
+        str: Path of the cached file, or None if it is not cached
+        """
+        path = self.path_for(key)
+        try:
+            # Refresh the modification time, which drives LRU eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get_or_create(self, text, language_code, synthesize):
+        """
+        Return the cached audio for a text, synthesizing it on a miss
+
+        Parameters:
+        text (str): Text to synthesize
+        language_code (str): Language code
+        synthesize (callable): Called with a binary file object to write the audio
+
+        Returns:
+        str: Path to the audio file
+        """
+        key = self.key(text, language_code)
+
+        with self._key_locks[int(key[:8], 16) % len(self._key_locks)]:
+            path = self.lookup(key)
+            if path is not None:
+                with self._stats_lock:
+                    self.hits += 1
+                return path
+
+            with self._stats_lock:
+                self.misses += 1
+
+            path = self.path_for(key)
+            atomic_write(path, synthesize)
+
+        self._evict(keep=path)
+        return path
+
+    def stats(self):
+        """
+        Get hit/miss counters and the current directory size
+
+        Returns:
+        dict: Cache statistics
+        """
+        files = self._files()
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "files": len(files),
+                "bytes": sum(size for _, size, _ in files),
+                "max_bytes": self.max_bytes
+            }
+
+    def _files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.extension):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self, keep):
+        with self._eviction_lock:
+            files = self._files()
+            total = sum(size for _, size, _ in files)
+
+            # Remove least recently used files first
+            for path, size, _ in sorted(files, key=lambda item: item[2]):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
@@ -0,0 +1,127 @@
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+
+SIMHASH_BITS = 64
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Per-bit counters are packed into fixed-width lanes of one integer, so each
+# feature is added with a single big-integer operation instead of 64
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+BYTE_LANES = [sum((byte >> bit & 1) << (LANE_BITS * bit) for bit in range(8)) for byte in range(256)]
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+@lru_cache(maxsize=65536)
+def _feature_lanes(feature):
+    # Spread the feature hash so bit i becomes the lowest bit of lane i
+    feature_hash = _token_hash(feature)
+    lanes = 0
+    for byte_index in range(SIMHASH_BITS // 8):
+        lanes |= BYTE_LANES[feature_hash >> (8 * byte_index) & 0xFF] << (LANE_BITS * 8 * byte_index)
+    return lanes
+
+def simhash(text):
+    """
+    Compute a 64-bit SimHash fingerprint of a text
+
+    Features are lowercased words and adjacent word pairs, weighted by how
+    often they occur, so texts that differ by a few words get fingerprints
+    that differ in only a few bits.
+
+    Parameters:
+    text (str): Text to fingerprint
+
+    Returns:
+    int: Fingerprint
+    """
+    words = TOKEN_PATTERN.findall(text.lower())
+    features = Counter(words)
+    features.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+
+    # Lane i counts the weight of features whose hash has bit i set
+    set_weights = 0
+    total_weight = 0
+    for feature, count in features.items():
+        set_weights += count * _feature_lanes(feature)
+        total_weight += count
+
+    # A bit is set when features with it set outweigh those without
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        if (set_weights >> (LANE_BITS * bit) & LANE_MASK) * 2 > total_weight:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(first, second):
+    """
+    Count the bits that differ between two fingerprints
+
+    Parameters:
+    first (int): Fingerprint
+    second (int): Fingerprint
+
+    Returns:
+    int: Number of differing bits
+    """
+    return bin(first ^ second).count("1")
+
+def _bands(fingerprint, band_count):
+    # Split the fingerprint into band_count roughly equal bit ranges
+    bands = []
+    start = 0
+    for band in range(band_count):
+        width = (SIMHASH_BITS - start) // (band_count - band)
+        bands.append((band, fingerprint >> start & ((1 << width) - 1)))
+        start += width
+    return bands
+
+def cluster_near_duplicates(texts, max_distance=3):
+    """
+    Group texts whose SimHash fingerprints differ by at most max_distance bits
+
+    Each text either joins the first earlier cluster whose representative is
+    close enough, or starts a new cluster. Candidates are found through
+    max_distance + 1 bands of the fingerprint: two fingerprints within
+    max_distance bits must agree on at least one band, so only texts sharing
+    a band are compared.
+
+    Parameters:
+    texts (list): Texts to cluster
+    max_distance (int): Maximum number of differing fingerprint bits within a cluster
+
+    Returns:
+    list: Clusters as lists of text indices, in order of their first text
+    """
+    band_count = min(max_distance + 1, SIMHASH_BITS)
+    buckets = {}  # (band, value) -> indices of clusters whose representative has that band
+    representatives = []  # cluster index -> representative fingerprint
+    clusters = []
+
+    for index, text in enumerate(texts):
+        fingerprint = simhash(text)
+        bands = _bands(fingerprint, band_count)
+
+        # Representatives can share several bands with this text; compare each once, earliest first
+        candidates = set()
+        for band in bands:
+            candidates.update(buckets.get(band, ()))
+
+        match = next((cluster_index for cluster_index in sorted(candidates)
+                      if hamming_distance(fingerprint, representatives[cluster_index]) <= max_distance), None)
+
+        if match is not None:
+            clusters[match].append(index)
+            continue
+
+        cluster_index = len(clusters)
+        clusters.append([index])
+        representatives.append(fingerprint)
+        for band in bands:
+            buckets.setdefault(band, []).append(cluster_index)
+
+    return clusters
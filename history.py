@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+import time
+
+from cache import normalize_query, sqlite_connection
+from records import Sentiment
+
+SECONDS_PER_DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company TEXT NOT NULL,
+    company_key TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    article_count INTEGER NOT NULL,
+    positive INTEGER NOT NULL,
+    negative INTEGER NOT NULL,
+    neutral INTEGER NOT NULL,
+    final_sentiment TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_company_time ON runs (company_key, created_at);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    company_key TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    title TEXT,
+    summary TEXT,
+    sentiment INTEGER NOT NULL,
+    topics TEXT NOT NULL,
+    cluster_size INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS articles_company_time ON articles (company_key, created_at);
+CREATE INDEX IF NOT EXISTS articles_run ON articles (run_id);
+"""
+
+class HistoryStore:
+    """
+    Embedded SQLite store of analysis results over time
+
+    Every recorded run keeps its per-article results and its sentiment
+    aggregates, indexed by company and timestamp, so history can be queried
+    without rerunning the pipeline.
+    """
+
+    def __init__(self, db_path):
+        """
+        Parameters:
+        db_path (str): SQLite database file, created if missing
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+
+        # Databases created before near-duplicate clustering lack the column; their rows count once each
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(articles)")}
+        if "cluster_size" not in columns:
+            with connection:
+                connection.execute("ALTER TABLE articles ADD COLUMN cluster_size INTEGER NOT NULL DEFAULT 1")
+
+    def record_run(self, processed_data, created_at=None):
+        """
+        Store one process_news_articles result
+
+        Parameters:
+        processed_data (dict): Output of process_news_articles
+        created_at (float, optional): Unix timestamp of the run, defaults to now
+
+        Returns:
+        int: ID of the stored run
+        """
+        return self.record_runs([processed_data], created_at)[0]
+
+    def record_runs(self, runs, created_at=None):
+        """
+        Store several process_news_articles results in one transaction
+
+        Parameters:
+        runs (list): Outputs of process_news_articles
+        created_at (float, optional): Unix timestamp of the runs, defaults to now
+
+        Returns:
+        list: IDs of the stored runs, in input order
+        """
+        created_at = time.time() if created_at is None else created_at
+        connection = self._connection()
+        run_ids = []
+
+        with connection:
+            for processed_data in runs:
+                distribution = processed_data["Comparative Sentiment Score"]["Sentiment Distribution"]
+                key = normalize_query(processed_data["Company"])
+
+                cursor = connection.execute(
+                    "INSERT INTO runs (company, company_key, created_at, article_count, positive, negative, neutral, final_sentiment) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (processed_data["Company"], key, created_at, len(processed_data["Articles"]),
+                     distribution["Positive"], distribution["Negative"], distribution["Neutral"],
+                     processed_data["Final Sentiment Analysis"])
+                )
+                run_id = cursor.lastrowid
+                run_ids.append(run_id)
+
+                connection.executemany(
+                    "INSERT INTO articles (run_id, company_key, created_at, title, summary, sentiment, topics, cluster_size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (run_id, key, created_at, article["Title"], article["Summary"],
+                         int(Sentiment.from_label(article["Sentiment"])), json.dumps(article["Topics"], ensure_ascii=False),
+                         article.get("Cluster Size", 1))
+                        for article in processed_data["Articles"]
+                    ]
+                )
+
+        return run_ids
+
+    def sentiment_distribution(self, company, days=None, since=None, until=None):
+        """
+        Count recorded articles by sentiment for a company over a time range
+
+        Each stored article counts once for every near-duplicate it stands for (its "Cluster Size").
+
+        Parameters:
+        company (str): Company name
+        days (float, optional): Only include the last N days; ignored when since is given
+        since (float, optional): Start of the range as a Unix timestamp
+        until (float, optional): End of the range as a Unix timestamp, defaults to now
+
+        Returns:
+        dict: Counts with "Positive", "Negative" and "Neutral" keys
+        """
+        since, until = self._time_range(days, since, until)
+        rows = self._connection().execute(
+            "SELECT sentiment, SUM(cluster_size) FROM articles WHERE company_key = ? AND created_at BETWEEN ? AND ? GROUP BY sentiment",
+            (normalize_query(company), since, until)
+        ).fetchall()
+
+        distribution = {"Positive": 0, "Negative": 0, "Neutral": 0}
+        for sentiment, count in rows:
+            distribution[Sentiment(sentiment).label] = count
+
+        return distribution
+
+    def daily_distribution(self, company, days=None, since=None, until=None):
+        """
+        Count recorded articles by day and sentiment for a company, weighted by cluster size
+
+        Parameters:
+        company (str): Company name
+        days (float, optional): Only include the last N days; ignored when since is given
+        since (float, optional): Start of the range as a Unix timestamp
+        until (float, optional): End of the range as a Unix timestamp, defaults to now
+
+        Returns:
+        list: One dict per day (UTC) with "Date", "Positive", "Negative" and "Neutral" keys, oldest first
+        """
+        since, until = self._time_range(days, since, until)
+        rows = self._connection().execute(
+            "SELECT date(created_at, 'unixepoch') AS day, sentiment, SUM(cluster_size) FROM articles "
+            "WHERE company_key = ? AND created_at BETWEEN ? AND ? GROUP BY day, sentiment ORDER BY day",
+            (normalize_query(company), since, until)
+        ).fetchall()
+
+        days_seen = {}
+        for day, sentiment, count in rows:
+            entry = days_seen.setdefault(day, {"Date": day, "Positive": 0, "Negative": 0, "Neutral": 0})
+            entry[Sentiment(sentiment).label] = count
+
+        return list(days_seen.values())
+
+    def runs(self, company, days=None, since=None, until=None, limit=100):
+        """
+        List recorded runs for a company, newest first
+
+        Parameters:
+        company (str): Company name
+        days (float, optional): Only include the last N days; ignored when since is given
+        since (float, optional): Start of the range as a Unix timestamp
+        until (float, optional): End of the range as a Unix timestamp, defaults to now
+        limit (int): Maximum number of runs to return
+
+        Returns:
+        list: Run dicts with aggregate counts and the final sentiment analysis, as the run reported them
+        (one count per article after near-duplicates were collapsed)
+        """
+        since, until = self._time_range(days, since, until)
+        rows = self._connection().execute(
+            "SELECT id, company, created_at, article_count, positive, negative, neutral, final_sentiment FROM runs "
+            "WHERE company_key = ? AND created_at BETWEEN ? AND ? ORDER BY created_at DESC LIMIT ?",
+            (normalize_query(company), since, until, limit)
+        ).fetchall()
+
+        return [
+            {
+                "Run ID": run_id,
+                "Company": company_name,
+                "Created At": created_at,
+                "Article Count": article_count,
+                "Sentiment Distribution": {"Positive": positive, "Negative": negative, "Neutral": neutral},
+                "Final Sentiment Analysis": final_sentiment
+            }
+            for run_id, company_name, created_at, article_count, positive, negative, neutral, final_sentiment in rows
+        ]
+
+    def _time_range(self, days, since, until):
+        until = time.time() if until is None else until
+        if since is None:
+            since = until - days * SECONDS_PER_DAY if days is not None else 0
+        return since, until
+
+    def _connection(self):
+        return sqlite_connection(self._local, self.db_path)
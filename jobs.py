@@ -0,0 +1,201 @@
+import copy
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its depth limit"""
+
+class JobManager:
+    """
+    Runs jobs on a bounded pool of background workers
+
+    Submitting a job returns an ID immediately; its status and result can be
+    polled until result_ttl seconds after it finishes, when it is discarded.
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, result_ttl=600):
+        """
+        Parameters:
+        max_workers (int): Number of background worker threads
+        max_pending (int): Maximum number of queued plus running jobs
+        result_ttl (float): Seconds a finished job's result is kept
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue a job for background execution
+
+        Parameters:
+        func (callable): Function to run
+        *args, **kwargs: Arguments for func
+
+        Returns:
+        str: Job ID
+        """
+        with self._lock:
+            self._expire(time.time())
+
+            if self._pending_count() >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None
+            }
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """
+        Get a job's status and, once finished, its result or error
+
+        Parameters:
+        job_id (str): Job ID returned by submit
+
+        Returns:
+        dict: A copy of the job record, or None if it is unknown or expired
+        """
+        with self._lock:
+            self._expire(time.time())
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def stats(self):
+        """
+        Get counts of jobs by status
+
+        Returns:
+        dict: Queue statistics
+        """
+        with self._lock:
+            self._expire(time.time())
+            counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+            return dict(counts, max_pending=self.max_pending, max_workers=self.max_workers)
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and optionally wait for running jobs"""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id, func, args, kwargs):
+        with self._lock:
+            self._jobs[job_id].update(status="running", started_at=time.time())
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._jobs[job_id].update(status="failed", error=str(e), finished_at=time.time())
+            return
+
+        with self._lock:
+            self._jobs[job_id].update(status="completed", result=result, finished_at=time.time())
+
+    def _pending_count(self):
+        # Caller must hold the lock
+        return sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+
+    def _expire(self, now):
+        # Caller must hold the lock
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["finished_at"] is not None and now - job["finished_at"] > self.result_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive a copy of the same result (or the
+    same exception) instead of starting their own run.
+    """
+
+    def __init__(self, on_coalesced=None):
+        """
+        Parameters:
+        on_coalesced (callable): Called with no arguments each time a caller waits for an in-flight run
+        """
+        self.on_coalesced = on_coalesced
+        self.executions = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Run func, or wait for an in-flight run with the same key
+
+        Parameters:
+        key: Hashable key identifying equivalent calls
+        func (callable): Function to run
+        *args, **kwargs: Arguments for func
+
+        Returns:
+        The result of func
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if self.on_coalesced is not None:
+                self.on_coalesced()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each waiter gets its own copy so callers cannot affect each other
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        Get execution and coalesced-wait counters
+
+        Returns:
+        dict: Coalescing statistics
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced_waits": self.coalesced,
+                "in_flight": len(self._calls)
+            }
@@ -0,0 +1,222 @@
+import re
+from collections import Counter
+
+# SpaCy's English stop words are imported on first use; they need no model, only the spacy package
+_stop_words = None
+
+# Words, keeping internal apostrophes, hyphens, periods and ampersands ("U.S.", "AT&T", "e-commerce"),
+# and single punctuation marks, which end phrases
+TOKEN_PATTERN = re.compile(r"\w(?:[\w&'’.-]*\w)?\.?|[^\w\s]")
+
+SENTENCE_END = {".", "!", "?"}
+
+# Words allowed inside a capitalized phrase when another capitalized word follows ("Bank of America")
+PHRASE_CONNECTORS = {"of", "&", "de", "for"}
+
+# Capitalized but never ORG/PRODUCT/EVENT/GPE/WORK_OF_ART entities
+CALENDAR_WORDS = {
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december"
+}
+
+MAX_PHRASE_WORDS = 4
+
+# Without a tagger, verbs are guessed: these common news verbs and lowercase words ending in "-ed"
+# end keyword phrases, so "Google announced a new AI model" gives "AI model", not "Google announced"
+PHRASE_BREAKING_VERBS = {
+    "said", "says", "say", "told", "rose", "rise", "rises", "fell", "fall", "falls", "cut", "cuts",
+    "went", "made", "won", "lost", "hit", "hits", "saw", "sold", "beat", "led", "grew", "took",
+    "gave", "set", "sets", "faces", "plans", "remains", "remain", "expects", "adds", "added"
+}
+
+def get_stop_words():
+    """
+    Get SpaCy's English stop words
+
+    Returns:
+    set: Lowercase stop words
+    """
+    global _stop_words
+    if _stop_words is None:
+        from spacy.lang.en.stop_words import STOP_WORDS
+        _stop_words = STOP_WORDS
+    return _stop_words
+
+def _tokenize(text):
+    # Possessives end a name ("Apple's shares" -> "Apple", "shares"), so split them off as punctuation
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token.endswith(("'s", "’s")) and len(token) > 2:
+            tokens.extend((token[:-2], "'s"))
+        elif token.endswith(".") and len(token) > 1 and token.count(".") == 1:
+            # A sentence-final period, not an abbreviation like "U.S."
+            tokens.extend((token[:-1], "."))
+        else:
+            tokens.append(token)
+    return tokens
+
+def _is_word(token):
+    return token[0].isalnum()
+
+def _is_capitalized(token):
+    # "Tesla", "NASA" and "iPhone" count, "shares" and "2024" do not
+    return token[0].isupper() or (token[0].islower() and any(char.isupper() for char in token[1:]))
+
+def _is_verb_like(token):
+    lower = token.lower()
+    return lower in PHRASE_BREAKING_VERBS or (token.islower() and len(token) > 4 and lower.endswith("ed"))
+
+def _is_distinctive(token):
+    # Capitalization that cannot come from starting a sentence
+    return token.isupper() and len(token) > 1 or any(char.isupper() for char in token[1:])
+
+def capitalized_phrases(tokens):
+    """
+    Find runs of capitalized words, which stand in for named entities
+
+    Stop words at either end of a run are dropped ("The Federal Reserve" ->
+    "Federal Reserve"). A lone capitalized word starting a sentence may just
+    be an ordinary word, so unless its capitalization is distinctive or it is
+    capitalized elsewhere in the text, it is listed after the other phrases.
+
+    Parameters:
+    tokens (list): Tokens from _tokenize
+
+    Returns:
+    list: Phrases in order of first appearance, followed by uncertain sentence openers
+    """
+    stop_words = get_stop_words()
+    mid_sentence_capitalized = set()
+    runs = []
+    sentence_start = True
+    index = 0
+
+    while index < len(tokens):
+        token = tokens[index]
+        if not (_is_word(token) and _is_capitalized(token)):
+            sentence_start = token in SENTENCE_END
+            index += 1
+            continue
+
+        run = [token]
+        index += 1
+        while index < len(tokens):
+            if _is_word(tokens[index]) and _is_capitalized(tokens[index]):
+                run.append(tokens[index])
+                index += 1
+            elif (tokens[index].lower() in PHRASE_CONNECTORS and index + 1 < len(tokens)
+                  and _is_word(tokens[index + 1]) and _is_capitalized(tokens[index + 1])):
+                run.extend(tokens[index:index + 2])
+                index += 2
+            else:
+                break
+
+        if not sentence_start:
+            mid_sentence_capitalized.update(word.lower() for word in run)
+        runs.append((run, sentence_start))
+        sentence_start = False
+
+    lowercase_words = {token for token in tokens if token.islower()}
+    phrases = []
+    openers = []
+    for run, starts_sentence in runs:
+        # A sentence opener followed by a connector is an ordinary word ("Shares of Ford" -> "Ford")
+        if (starts_sentence and len(run) > 2 and run[1].lower() in PHRASE_CONNECTORS
+                and not _is_distinctive(run[0]) and run[0].lower() not in mid_sentence_capitalized):
+            run = run[2:]
+            starts_sentence = False
+        while run and (run[0].lower() in stop_words or run[0].lower() in PHRASE_CONNECTORS):
+            run = run[1:]
+            starts_sentence = False
+        while run and (run[-1].lower() in stop_words or run[-1].lower() in PHRASE_CONNECTORS):
+            run = run[:-1]
+        if not run or all(word.lower() in CALENDAR_WORDS for word in run):
+            continue
+
+        if (len(run) == 1 and starts_sentence and not _is_distinctive(run[0])
+                and run[0].lower() not in mid_sentence_capitalized):
+            # Could be a name ("Microsoft shares slipped") or an ordinary word ("Investors cheered"),
+            # so it is kept unless the text also uses it in lowercase, and ranked after the other phrases
+            if run[0].lower() not in lowercase_words:
+                openers.append(run[0])
+            continue
+        phrases.append(" ".join(run))
+
+    return phrases + openers
+
+def ranked_phrases(tokens):
+    """
+    Rank multi-word keyword phrases with RAKE
+
+    Candidate phrases are runs of content words between stop words, verb-like
+    words and punctuation. Each word scores its degree (the total length of the phrases
+    it appears in) divided by its frequency, and a phrase scores the sum of
+    its words, so longer phrases of words that rarely stand alone rank first.
+
+    Parameters:
+    tokens (list): Tokens from _tokenize
+
+    Returns:
+    list: Phrases of two to MAX_PHRASE_WORDS words, best first
+    """
+    stop_words = get_stop_words()
+    candidates = []
+    current = []
+
+    for token in tokens + ["."]:
+        if (_is_word(token) and any(char.isalpha() for char in token) and token.lower() not in stop_words
+                and not _is_verb_like(token)):
+            current.append(token)
+            continue
+        if 1 < len(current) <= MAX_PHRASE_WORDS:
+            candidates.append(current)
+        current = []
+
+    frequency = Counter()
+    degree = Counter()
+    for phrase in candidates:
+        for word in phrase:
+            frequency[word.lower()] += 1
+            degree[word.lower()] += len(phrase)
+
+    scored = {}
+    for position, phrase in enumerate(candidates):
+        text = " ".join(phrase)
+        if text.lower() not in scored:
+            scored[text.lower()] = (-sum(degree[word.lower()] / frequency[word.lower()] for word in phrase), position, text)
+
+    return [text for _, _, text in sorted(scored.values())]
+
+def frequent_keywords(tokens, count=5):
+    """
+    Find the most frequent content words
+
+    Parameters:
+    tokens (list): Tokens from _tokenize
+    count (int): Maximum number of keywords
+
+    Returns:
+    list: Lowercase words longer than three letters that do not look like verbs, most frequent first
+    """
+    stop_words = get_stop_words()
+    words = [token.lower() for token in tokens
+             if token.isalpha() and token.lower() not in stop_words and len(token) > 3 and not _is_verb_like(token)]
+    return [word for word, _ in Counter(words).most_common(count)]
+
+def keyword_topic_candidates(text):
+    """
+    Collect topic candidates from a text without a SpaCy pipeline
+
+    The three lists mirror the entities, noun phrases and frequent lemmas the
+    SpaCy topic path draws on, using capitalized phrases, RAKE phrases and
+    word frequencies instead, so no tagger, parser or NER model is needed.
+
+    Parameters:
+    text (str): Text to analyze
+
+    Returns:
+    tuple: (capitalized phrases, keyword phrases, frequent keywords) lists
+    """
+    tokens = _tokenize(text)
+    return capitalized_phrases(tokens), ranked_phrases(tokens), frequent_keywords(tokens)
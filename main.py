@@ -1,28 +1,103 @@
 import requests
-from bs4 import BeautifulSoup
-import nltk
+from bs4 import BeautifulSoup, SoupStrainer
 import os
-from nltk.sentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
-import spacy
+import subprocess
+import sys
 from collections import Counter
-from gtts import gTTS
+from itertools import islice
 import tempfile
-import os
-from IPython.display import Audio, display
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from cache import TTLCache, NLPResultCache, AudioCache, atomic_write, normalize_query
+from records import NewsArticle, ProcessedArticle, Sentiment, as_processed_article
+from dedup import cluster_near_duplicates
+from keyword_topics import get_stop_words, keyword_topic_candidates
+from sentiment_backends import get_sentiment_backend
+from metrics import registry
+import importlib.metadata
+import importlib.util
+
+# Pipeline metrics, exported by the API's /metrics endpoint. Recording is a lock and a few additions per call
+stage_duration = registry.histogram("news_stage_duration_seconds", "Time spent in each pipeline stage", ["stage"])
+articles_fetched = registry.counter("news_articles_fetched", "Articles returned by news searches")
+articles_processed = registry.counter("news_articles_processed", "Articles run through sentiment and topic analysis")
+near_duplicates_collapsed = registry.counter("news_near_duplicates_collapsed", "Articles dropped as near-duplicates of another article")
+pipeline_errors = registry.counter("news_errors", "Failures by pipeline stage", ["stage"])
+
+# NLTK, TextBlob, SpaCy and gTTS are imported on first use so that importing this module stays fast
+SPACY_MODEL = "en_core_web_sm"
+
+# Sentiment backend from sentiment_backends.BACKENDS: "combined" runs TextBlob and VADER,
+# "lexicon" reproduces their scores in one faster pass over a merged lexicon
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "combined")
+
+# "spacy" takes topics from entities, noun chunks and lemmas of a full SpaCy parse,
+# "keywords" approximates them with capitalized and RAKE phrases, without loading a model
+TOPIC_MODES = ("spacy", "keywords")
+TOPIC_MODE = os.getenv("TOPIC_MODE", "spacy")
+
+_nlp = None
+_nlp_lock = threading.Lock()
 
-# Download NLTK resources (only needed once)
-home_dir = os.getenv("USERPROFILE")  # On Windows, use USERPROFILE instead of HOME
-nltk.data.path.append(os.path.join(home_dir, "nltk_data"))
+def get_nlp():
+    """
+    Get the shared SpaCy pipeline, loading it (and downloading the model if needed) on first use
+    
+    Returns:
+    spacy.language.Language: The loaded SPACY_MODEL pipeline
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                
+                try:
+                    _nlp = spacy.load(SPACY_MODEL)
+                except OSError:
+                    subprocess.run([sys.executable, "-m", "spacy", "download", SPACY_MODEL], check=True)
+                    _nlp = spacy.load(SPACY_MODEL)
+    return _nlp
 
-# Load SpaCy model (run once)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+def __getattr__(name):
+    # Keep "from main import nlp" working without loading the model at import time
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warmup():
+    """
+    Load models and libraries ahead of the first request, e.g. when a server starts
+    
+    Returns:
+    dict: Seconds spent loading each component
+    """
+    timings = {}
+    
+    # The keyword topic mode only needs SpaCy's stop word list, not a model
+    start = time.perf_counter()
+    if _topic_mode(None) == "keywords":
+        get_stop_words()
+        timings["keywords"] = time.perf_counter() - start
+    else:
+        get_nlp()
+        timings["spacy"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    get_sentiment_analyzer()
+    timings["sentiment"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    import gtts
+    timings["gtts"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    get_http_session()
+    timings["http"] = time.perf_counter() - start
+    
+    return timings
 
 LANGUAGE_CODES = {
     "1": {"name": "Telugu", "code": "te"},
@@ -33,6 +108,11 @@ LANGUAGE_CODES = {
     "6": {"name": "Kannada", "code": "kn"}
 }
 
+# Content-addressed cache of synthesized speech, so identical summaries are only synthesized once
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "news_analyzer_tts"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+audio_cache = AudioCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES)
+
 def text_to_speech(text, language_code, output_file=None):
     """
     Convert text to speech using gTTS in the specified language
@@ -40,24 +120,41 @@ def text_to_speech(text, language_code, output_file=None):
     Parameters:
     text (str): Text to convert to speech
     language_code (str): Language code for gTTS
-    output_file (str, optional): Path to save the audio file. If None, a temporary file will be created.
+    output_file (str, optional): Path to save the audio file. If None, the audio is served from the speech cache.
     
     Returns:
     str: Path to the generated audio file
     """
-    # If no output file is specified, create a temporary file
+    def synthesize(f):
+        from gtts import gTTS
+        
+        with stage_duration.time(stage="tts"):
+            try:
+                # Create gTTS object with specified language
+                tts = gTTS(text=text, lang=language_code, slow=False)
+                tts.write_to_fp(f)
+            except Exception:
+                pipeline_errors.inc(stage="tts")
+                raise
+    
+    # If no output file is specified, reuse or create the cached file for this text and language
     if output_file is None:
-        temp_dir = tempfile.gettempdir()
-        output_file = os.path.join(temp_dir, f"speech_{language_code}.mp3")
-    
-    # Create gTTS object with specified language
-    tts = gTTS(text=text, lang=language_code, slow=False)
+        return audio_cache.get_or_create(text, language_code, synthesize)
     
     # Save the audio file
-    tts.save(output_file)
+    atomic_write(output_file, synthesize)
     
     return output_file
 
+def get_audio_cache_stats():
+    """
+    Get hit/miss statistics for the speech cache
+    
+    Returns:
+    dict: Cache statistics
+    """
+    return audio_cache.stats()
+
 def translate_sentiment_analysis(final_sentiment, language_code):
     """
     Translate the final sentiment analysis to the specified language
@@ -132,6 +229,7 @@ def translate_sentiment_analysis(final_sentiment, language_code):
     # Return original for English or if no translation available
     return final_sentiment
 
+@stage_duration.time(stage="translate")
 def translate_summary(processed_data, language_code):
     """
     Generate a summary in the specified language
@@ -302,23 +400,333 @@ def generate_speech_for_analysis(processed_data):
     
     return audio_file, summary_text, language_name
 
+def resolve_language(language):
+    """
+    Look up a language by its menu choice or its language code
+    
+    Parameters:
+    language (str): A LANGUAGE_CODES key such as "1", or a code such as "te"
+    
+    Returns:
+    dict: The LANGUAGE_CODES entry with "name" and "code" keys
+    """
+    if language in LANGUAGE_CODES:
+        return LANGUAGE_CODES[language]
+    
+    for entry in LANGUAGE_CODES.values():
+        if entry["code"] == language:
+            return entry
+    
+    raise ValueError(f"Unsupported language: {language}")
 
-def get_news_articles(query, num_articles=10):
-    search_url = f"https://www.bing.com/news/search?q={query}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36'
-    }
-    response = requests.get(search_url, headers=headers)
+def generate_speech_multi(processed_data, languages, max_workers=3):
+    """
+    Render summaries and synthesize speech for several languages concurrently
+    
+    Parameters:
+    processed_data (dict): The processed news data with sentiment analysis
+    languages (list): LANGUAGE_CODES keys or language codes
+    max_workers (int): Maximum number of languages synthesized at once
+    
+    Returns:
+    dict: Language code -> {"Language", "Summary", "Audio", "Error"}; a failed language does not affect the others
+    """
+    # Resolve up front so an unknown language fails before any synthesis starts
+    selected_languages = {}
+    for language in languages:
+        entry = resolve_language(language)
+        selected_languages[entry["code"]] = entry["name"]
+    
+    def render(language_code):
+        summary_text = translate_summary(processed_data, language_code)
+        return summary_text, text_to_speech(summary_text, language_code)
+    
+    results = {}
+    
+    if not selected_languages:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(selected_languages)))) as executor:
+        futures = {code: executor.submit(render, code) for code in selected_languages}
+        
+        for code, future in futures.items():
+            try:
+                summary_text, audio_file = future.result()
+                results[code] = {"Language": selected_languages[code], "Summary": summary_text, "Audio": audio_file, "Error": None}
+            except Exception as e:
+                results[code] = {"Language": selected_languages[code], "Summary": None, "Audio": None, "Error": str(e)}
+    
+    return results
+
+
+NEWS_SEARCH_URL = "https://www.bing.com/news/search"
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36'
+}
+REQUEST_TIMEOUT = 10
+# News cards on one results page, and how many further pages may be fetched at once
+NEWS_PAGE_SIZE = 10
+NEWS_PAGE_CONCURRENCY = 4
+MAX_NEWS_PAGES = 20
+# "fast" parses only the news card subtrees of a size-capped response, "full" parses the whole page
+NEWS_PARSE_MODE = os.getenv("NEWS_PARSE_MODE", "fast")
+MAX_RESPONSE_BYTES = int(os.getenv("NEWS_MAX_RESPONSE_BYTES", str(2 * 1024 * 1024)))
+
+def _is_news_card_class(class_value):
+    # The strainer sees the raw class attribute while parsing, e.g. "news-card newsitem cardcommon"
+    if not class_value:
+        return False
+    if isinstance(class_value, str):
+        class_value = class_value.split()
+    return "news-card" in class_value
+
+NEWS_CARD_STRAINER = SoupStrainer(class_=_is_news_card_class)
+
+# Use lxml for fast parsing when it is installed, it is considerably quicker than html.parser
+FAST_HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+# Connections kept alive per host. Each of the max_concurrency concurrent searches fetches up to
+# NEWS_PAGE_CONCURRENCY pages at once, so the default covers /api/news/batch's 16 searches. Requests beyond
+# the pool size wait for a free connection instead of opening one that would be discarded afterwards
+HTTP_POOL_SIZE = int(os.getenv("NEWS_HTTP_POOL_SIZE", str(16 * NEWS_PAGE_CONCURRENCY)))
+
+# Cache of parsed search results keyed on (normalized query, num_articles)
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "600"))
+NEWS_CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", "256"))
+news_cache = TTLCache(maxsize=NEWS_CACHE_SIZE, ttl=NEWS_CACHE_TTL, persist_dir=os.getenv("NEWS_CACHE_DIR"))
+
+# Shared HTTP session, created on first use so connections are reused across requests
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """
+    Get the shared keep-alive HTTP session used for news searches
+    
+    Returns:
+    requests.Session: Session with a connection pool of HTTP_POOL_SIZE, which caps requests in flight per host
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, pool_block=True)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(REQUEST_HEADERS)
+                _http_session = session
+    return _http_session
+
+def get_news_articles_many(queries, num_articles=10, max_concurrency=8):
+    """
+    Fetch news articles for several queries concurrently
+    
+    Parameters:
+    queries (list): Search queries, e.g. company names
+    num_articles (int): Maximum number of articles per query
+    max_concurrency (int): Maximum number of searches in flight at once
+    
+    Returns:
+    dict: Query -> {"Articles": list, "Error": str or None}; a failed query does not affect the others
+    """
+    # Preserve order while skipping repeated queries
+    unique_queries = list(dict.fromkeys(queries))
+    results = {}
+    
+    if not unique_queries:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(unique_queries)))) as executor:
+        futures = {query: executor.submit(fetch_news_articles, query, num_articles) for query in unique_queries}
+        
+        for query, future in futures.items():
+            try:
+                results[query] = {"Articles": future.result(), "Error": None}
+            except Exception as e:
+                results[query] = {"Articles": [], "Error": str(e)}
     
-    if response.status_code != 200:
+    return results
+
+def get_news_cache_stats():
+    """
+    Get hit/miss statistics for the news search cache
+    
+    Returns:
+    dict: Cache statistics
+    """
+    return news_cache.stats()
+
+def get_news_articles(query, num_articles=10, use_cache=True, max_pages=MAX_NEWS_PAGES):
+    try:
+        return fetch_news_articles(query, num_articles, use_cache, max_pages)
+    except requests.HTTPError:
         print("Failed to retrieve news articles")
         return []
+
+def fetch_news_articles(query, num_articles=10, use_cache=True, max_pages=MAX_NEWS_PAGES):
+    """
+    Fetch and parse news articles for a query, raising on failure
+    
+    Parameters:
+    query (str): Search query, e.g. a company name
+    num_articles (int): Maximum number of articles to return
+    use_cache (bool): Whether to serve and store results through the news cache
+    max_pages (int): Maximum number of results pages to fetch
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    Returns:
+    list: Article dicts with "Title", "Link" and "Summary" keys
+    """
+    # Fewer pages can yield fewer articles, so results for different page limits are cached separately
+    cache_key = (normalize_query(query), num_articles, max_pages)
+    
+    if use_cache:
+        cached_articles = news_cache.get(cache_key)
+        if cached_articles is not None:
+            # Hand out copies so callers cannot modify the cached entry
+            return [dict(article) for article in cached_articles]
+    
+    try:
+        articles, complete = _fetch_news_articles(query, num_articles, max_pages)
+    except Exception:
+        pipeline_errors.inc(stage="fetch")
+        raise
+    
+    articles_fetched.inc(len(articles))
+    
+    # Results missing a page that failed to load are returned but not cached, so the next call retries.
+    # Neither is an empty result, which is usually a consent or bot-check page rather than a real one
+    if use_cache and complete and articles:
+        news_cache.set(cache_key, [dict(article) for article in articles])
+    
+    return articles
+
+def _fetch_news_articles(query, num_articles, max_pages):
+    # Returns (articles, complete), where complete is False if a page after the first failed to load
     articles = []
-    seen_titles_and_summaries = set()  # Track combinations of title and summary
+    seen_titles_and_summaries = set()  # Track combinations of title and summary across pages
+    
+    def add_cards(cards):
+        added = 0
+        for card in cards:
+            # Create a combined unique key of title + summary
+            unique_key = (card["Title"], card["Summary"])
+            
+            # Check if the combination has been seen before to avoid duplicates
+            if unique_key not in seen_titles_and_summaries:
+                seen_titles_and_summaries.add(unique_key)
+                articles.append(card)
+                added += 1
+        return added
+    
+    # The first page decides whether the search worked at all
+    next_page = 1
+    exhausted = not add_cards(fetch_news_page(query, 0))
+    complete = True
+    
+    while len(articles) < num_articles and next_page < max_pages and not exhausted:
+        # Fetch only as many further pages at once as are likely to be needed
+        pages_needed = -(-(num_articles - len(articles)) // NEWS_PAGE_SIZE)
+        pages = list(range(next_page, min(next_page + min(pages_needed, NEWS_PAGE_CONCURRENCY), max_pages)))
+        next_page = pages[-1] + 1
+        
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            futures = [executor.submit(fetch_news_page, query, page) for page in pages]
+            
+            # Consume pages in order so results keep Bing's ranking
+            for future in futures:
+                try:
+                    cards = future.result()
+                except requests.RequestException:
+                    # A failed page says nothing about whether later pages have results, so keep going
+                    pipeline_errors.inc(stage="fetch")
+                    complete = False
+                    continue
+                
+                # An empty page, or one that only repeats earlier results, means there is nothing more to fetch
+                if not add_cards(cards):
+                    exhausted = True
+                    break
+                
+                if len(articles) >= num_articles:
+                    break
+    
+    return articles[:num_articles], complete
+
+def fetch_news_page(query, page):
+    """
+    Fetch and parse one page of news search results
+    
+    Parameters:
+    query (str): Search query
+    page (int): Zero-based results page
+    
+    Returns:
+    list: Article dicts for the news cards on the page, in page order
+    """
+    params = {"q": query}
+    if page > 0:
+        # Bing pages results with the 1-based index of the first result
+        params["first"] = page * NEWS_PAGE_SIZE + 1
+    
+    fast = NEWS_PARSE_MODE == "fast"
+    
+    with stage_duration.time(stage="fetch"):
+        response = get_http_session().get(NEWS_SEARCH_URL, params=params, timeout=REQUEST_TIMEOUT, stream=fast)
+        
+        try:
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Failed to retrieve news articles (status {response.status_code})", response=response)
+            
+            html = read_response_text(response, MAX_RESPONSE_BYTES) if fast else response.text
+        finally:
+            response.close()
+    
+    with stage_duration.time(stage="parse"):
+        return parse_news_cards(html, fast=fast)
+
+def read_response_text(response, max_bytes):
+    """
+    Read and decode at most max_bytes of a streamed response body
+    
+    Parameters:
+    response (requests.Response): Response opened with stream=True
+    max_bytes (int): Maximum number of bytes to read
+    
+    Returns:
+    str: Decoded (possibly truncated) body
+    """
+    chunks = []
+    size = 0
     
-    for item in soup.select(".news-card")[:num_articles]:
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+    
+    content = b"".join(chunks)[:max_bytes]
+    
+    # A cut at max_bytes can split a multi-byte character, so decode leniently
+    return content.decode(response.encoding or "utf-8", errors="replace")
+
+def parse_news_cards(html, fast=False):
+    """
+    Extract article records from a news search results page
+    
+    Parameters:
+    html (str): HTML of the results page
+    fast (bool): Build only the news card subtrees, with lxml when it is installed
+    
+    Returns:
+    list: Article dicts with "Title", "Link" and "Summary" keys, possibly containing duplicates
+    """
+    if fast:
+        soup = BeautifulSoup(html, FAST_HTML_PARSER, parse_only=NEWS_CARD_STRAINER)
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+    cards = []
+    
+    for item in soup.select(".news-card"):
         # Extract the title text from the <a> tag with class="title"
         title_tag = item.select_one("a.title")
         if title_tag:
@@ -334,39 +742,100 @@ def get_news_articles(query, num_articles=10):
         
         if title and link:
             summary = summary_tag.text.strip() if summary_tag else "No summary available"
-            
-            # Create a combined unique key of title + summary
-            unique_key = (title, summary)
-            
-            # Check if the combination has been seen before to avoid duplicates
-            if unique_key not in seen_titles_and_summaries:
-                seen_titles_and_summaries.add(unique_key)
-                # Using capitalized keys for consistency
-                articles.append({"Title": title, "Link": link, "Summary": summary})
+            # Using capitalized keys for consistency
+            cards.append({"Title": title, "Link": link, "Summary": summary})
     
-    return articles
+    return cards
+
+def _package_version(name):
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+# Bump when the sentiment or topic logic changes so cached NLP results are recomputed
+NLP_RESULT_VERSION = "1"
+NLP_CACHE_VERSION = "|".join([
+    NLP_RESULT_VERSION,
+    f"{SPACY_MODEL}-{_package_version(SPACY_MODEL)}",
+    f"spacy-{_package_version('spacy')}",
+    f"textblob-{_package_version('textblob')}",
+    f"nltk-{_package_version('nltk')}",
+    f"sentiment-{SENTIMENT_BACKEND}",
+    f"topics-{TOPIC_MODE}"
+])
 
+# Cache of per-summary NLP results shared across companies (and processes when NLP_CACHE_DB is set)
+NLP_CACHE_SIZE = int(os.getenv("NLP_CACHE_SIZE", "10000"))
+NLP_CACHE_DB_TTL = float(os.getenv("NLP_CACHE_DB_TTL", str(30 * 24 * 3600)))
+NLP_CACHE_DB_MAX_ROWS = int(os.getenv("NLP_CACHE_DB_MAX_ROWS", "1000000"))
+nlp_cache = NLPResultCache(NLP_CACHE_VERSION, maxsize=NLP_CACHE_SIZE, db_path=os.getenv("NLP_CACHE_DB"),
+                           db_ttl=NLP_CACHE_DB_TTL, db_max_rows=NLP_CACHE_DB_MAX_ROWS)
+
+def get_nlp_cache_stats():
+    """
+    Get hit/miss statistics for the NLP result cache
+    
+    Returns:
+    dict: Cache statistics
+    """
+    return nlp_cache.stats()
+
+def _cache_hit_ratios():
+    return {
+        ("news",): news_cache.stats()["hit_rate"],
+        ("nlp",): _nlp_cache_hit_rate(),
+        ("audio",): audio_cache.stats()["hit_rate"]
+    }
+
+def _nlp_cache_hit_rate():
+    stats = nlp_cache.stats()
+    hits = stats["memory_hits"] + stats["disk_hits"]
+    lookups = hits + stats["misses"]
+    return hits / lookups if lookups else 0.0
+
+# Cache statistics are only read when the metrics are rendered
+registry.gauge("news_cache_hit_ratio", "Fraction of cache lookups served from the cache", ["cache"], callback=_cache_hit_ratios)
+
+def get_sentiment_analyzer():
+    """
+    Get the shared SENTIMENT_BACKEND backend, loading its lexicons on first use
+    
+    Returns:
+    SentimentBackend: The loaded backend
+    """
+    backend = get_sentiment_backend(SENTIMENT_BACKEND)
+    backend.load()
+    return backend
+
+@stage_duration.time(stage="sentiment")
+def analyze_sentiment_batch(texts):
+    """
+    Score a list of texts with the shared sentiment backend
+    
+    Parameters:
+    texts (list): Texts to analyze
+    
+    Returns:
+    list: One dict per text with "Sentiment", "Polarity" and "Compound" keys
+    """
+    return get_sentiment_analyzer().analyze(texts)
 
 def analyze_sentiment(text):
-    # Using TextBlob
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity
-    
-    # Using VADER
-    sid = SentimentIntensityAnalyzer()
-    vader_scores = sid.polarity_scores(text)
-    
-    # Combine both approaches for more robust analysis
-    if polarity > 0.1 or vader_scores['compound'] > 0.05:
-        return "Positive"
-    elif polarity < -0.1 or vader_scores['compound'] < -0.05:
-        return "Negative"
-    else:
-        return "Neutral"
+    return analyze_sentiment_batch([text])[0]["Sentiment"]
 
-def extract_topics(text, num_topics=3):
-    # Process with SpaCy
-    doc = nlp(text)
+def topics_from_doc(doc, num_topics=3):
+    """
+    Select topics from a processed SpaCy document
+    
+    Parameters:
+    doc (Doc): SpaCy document for the text
+    num_topics (int): Maximum number of topics to return
+    
+    Returns:
+    list: Cleaned topic strings
+    """
+    text = doc.text
     
     # Extract named entities
     entities = [ent.text for ent in doc.ents if ent.label_ in ["ORG", "PRODUCT", "EVENT", "GPE", "WORK_OF_ART"]]
@@ -380,9 +849,31 @@ def extract_topics(text, num_topics=3):
     keywords = [word for word, count in word_freq.most_common(5)]
     
     # Combine and select unique topics
-    all_potential_topics = entities + noun_phrases + keywords
+    clean_topics = clean_topic_candidates(entities + noun_phrases + keywords)
+    seen = {topic.lower() for topic in clean_topics}
+    
+    # If we don't have enough topics, try to get the main subject
+    if not clean_topics and len(text) > 0:
+        # Try to extract the company or main subject from the text
+        for token in doc:
+            if token.pos_ == "PROPN" and len(token.text) > 3 and token.text.lower() not in seen:
+                seen.add(token.text.lower())
+                clean_topics.append(token.text.title())
+                if len(clean_topics) >= num_topics:
+                    break
+    
+    return clean_topics[:num_topics]
+
+def clean_topic_candidates(all_potential_topics):
+    """
+    Title-case and deduplicate topic candidates, dropping short ones and leading articles
     
-    # Clean and deduplicate topics
+    Parameters:
+    all_potential_topics (list): Candidate topic strings, best first
+    
+    Returns:
+    list: Cleaned topic strings in candidate order
+    """
     clean_topics = []
     seen = set()
     for topic in all_potential_topics:
@@ -401,61 +892,181 @@ def extract_topics(text, num_topics=3):
             seen.add(topic.lower())
             clean_topics.append(topic)
     
-    # If we don't have enough topics, try to get the main subject
-    if not clean_topics and len(text) > 0:
-        # Try to extract the company or main subject from the text
-        for token in doc:
-            if token.pos_ == "PROPN" and len(token.text) > 3 and token.text.lower() not in seen:
-                seen.add(token.text.lower())
-                clean_topics.append(token.text.title())
-                if len(clean_topics) >= num_topics:
-                    break
+    return clean_topics
+
+def topics_from_keywords(text, num_topics=3):
+    """
+    Select topics from a text with keyword heuristics instead of a SpaCy parse
     
-    return clean_topics[:num_topics]
+    Capitalized phrases take the place of named entities, RAKE phrases the place
+    of noun chunks and frequent words the place of frequent lemmas, so topics are
+    approximate but need no model and are many times faster to compute.
+    
+    Parameters:
+    text (str): Text to analyze
+    num_topics (int): Maximum number of topics to return
+    
+    Returns:
+    list: Cleaned topic strings
+    """
+    capitalized, phrases, keywords = keyword_topic_candidates(text)
+    return clean_topic_candidates(capitalized + phrases + keywords)[:num_topics]
+
+def _topic_mode(mode):
+    # The single-text and batched paths must agree, so both reject unknown modes instead of falling back to SpaCy
+    mode = mode or TOPIC_MODE
+    if mode not in TOPIC_MODES:
+        raise ValueError(f"Unknown topic mode {mode!r}; choose from {', '.join(TOPIC_MODES)}")
+    return mode
+
+def extract_topics(text, num_topics=3, mode=None):
+    if _topic_mode(mode) == "keywords":
+        return topics_from_keywords(text, num_topics)
+    
+    # Process with SpaCy
+    doc = get_nlp()(text)
+    
+    return topics_from_doc(doc, num_topics)
+
+@stage_duration.time(stage="topics")
+def extract_topics_batch(texts, num_topics=3, batch_size=64, n_process=1, mode=None):
+    """
+    Extract topics for a list of texts, streaming them through nlp.pipe in SpaCy mode
+    
+    Parameters:
+    texts (list): Texts to analyze
+    num_topics (int): Maximum number of topics per text
+    batch_size (int): Number of texts SpaCy processes per batch
+    n_process (int): Number of worker processes for SpaCy (1 runs in-process)
+    mode (str, optional): "spacy" or "keywords", defaults to TOPIC_MODE
+    
+    Returns:
+    list: One topic list per text, identical to calling extract_topics on each text
+    """
+    if _topic_mode(mode) == "keywords":
+        return [topics_from_keywords(text, num_topics) for text in texts]
+    
+    # The topic logic reads entities, noun chunks, lemmas and POS tags, so every enabled
+    # component is needed; nlp.pipe runs the same components as calling nlp on each text
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    
+    return [topics_from_doc(doc, num_topics) for doc in docs]
+
+# How strongly two sentiments contrast; opposite polarity outranks polarity vs neutral
+SENTIMENT_CONTRAST = {
+    frozenset((Sentiment.POSITIVE, Sentiment.NEGATIVE)): 2,
+    frozenset((Sentiment.POSITIVE, Sentiment.NEUTRAL)): 1,
+    frozenset((Sentiment.NEGATIVE, Sentiment.NEUTRAL)): 1
+}
+MAX_COMPARISONS = 3
+# Articles per sentiment considered for each topic, which keeps pair generation linear in article count
+COMPARISON_BUCKET_LIMIT = 8
+
+def find_contrasting_pairs(articles, topic_index, limit=MAX_COMPARISONS):
+    """
+    Find the most contrasting article pairs across the whole set
+    
+    Pairs with different sentiments that share topics are ranked by how strongly their
+    sentiments contrast, then by the number of topics they share. Ties keep article order.
+    Pairs without shared topics are only used when too few pairs share topics.
+    
+    Parameters:
+    articles (list): ProcessedArticle records
+    topic_index (dict): Topic -> indices of the articles mentioning it
+    limit (int): Maximum number of pairs to return
+    
+    Returns:
+    list: (i, j) index pairs with i < j, most contrasting first
+    """
+    shared_topic_counts = Counter()
+    
+    for indices in topic_index.values():
+        if len(indices) < 2:
+            continue
+        
+        # Group the articles mentioning this topic by sentiment
+        buckets = {}
+        for index in indices:
+            bucket = buckets.setdefault(articles[index].sentiment, [])
+            if len(bucket) < COMPARISON_BUCKET_LIMIT:
+                bucket.append(index)
+        
+        sentiments = sorted(buckets)
+        for a in range(len(sentiments)):
+            for b in range(a + 1, len(sentiments)):
+                for i in buckets[sentiments[a]]:
+                    for j in buckets[sentiments[b]]:
+                        shared_topic_counts[(min(i, j), max(i, j))] += 1
+    
+    ranked = sorted(
+        shared_topic_counts,
+        key=lambda pair: (
+            -SENTIMENT_CONTRAST[frozenset((articles[pair[0]].sentiment, articles[pair[1]].sentiment))],
+            -shared_topic_counts[pair],
+            pair
+        )
+    )
+    
+    # If too few pairs share topics, fall back to contrasting the first article of each sentiment
+    if len(ranked) < limit:
+        first_by_sentiment = {}
+        for index, article in enumerate(articles):
+            first_by_sentiment.setdefault(article.sentiment, index)
+        firsts = sorted(first_by_sentiment.items())
+        fallback_pairs = sorted(
+            ((min(i, j), max(i, j)) for a, (_, i) in enumerate(firsts) for _, j in firsts[a + 1:]),
+            key=lambda pair: (-SENTIMENT_CONTRAST[frozenset((articles[pair[0]].sentiment, articles[pair[1]].sentiment))], pair)
+        )
+        ranked += [pair for pair in fallback_pairs if pair not in shared_topic_counts]
+    
+    # Prefer pairs that introduce articles not reported yet, then fill up with the rest
+    selected = []
+    used = set()
+    for pair in ranked:
+        if len(selected) == limit:
+            break
+        if pair[0] not in used and pair[1] not in used:
+            selected.append(pair)
+            used.update(pair)
+    for pair in ranked:
+        if len(selected) == limit:
+            break
+        if pair not in selected:
+            selected.append(pair)
+    
+    return sorted(selected, key=ranked.index)
 
+@stage_duration.time(stage="comparative")
 def perform_comparative_analysis(articles):
-    # Calculate sentiment distribution
-    sentiment_counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
-    for article in articles:
-        sentiment_counts[article["Sentiment"]] += 1
+    # Accept processed article dicts as well as ProcessedArticle records
+    articles = [as_processed_article(article) for article in articles]
     
-    # Find all topics across articles
-    all_topics = set()
-    for article in articles:
-        all_topics.update(article["Topics"])
+    # Calculate sentiment distribution and build a topic -> articles index in one pass
+    sentiment_counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    topic_index = {}
+    for i, article in enumerate(articles):
+        sentiment_counts[article.sentiment.label] += 1
+        for topic in article.topics:
+            topic_index.setdefault(topic, []).append(i)
     
     # Find topic overlap
-    topic_frequency = {topic: 0 for topic in all_topics}
-    for article in articles:
-        for topic in article["Topics"]:
-            topic_frequency[topic] += 1
+    common_topics = [topic for topic, indices in topic_index.items() if len(indices) > 1]
     
-    common_topics = [topic for topic, count in topic_frequency.items() if count > 1]
-    
-    # Generate comparisons between articles
+    # Generate comparisons between the most contrasting articles
     comparisons = []
-    if len(articles) >= 2:
-        for i in range(len(articles)-1):
-            for j in range(i+1, min(i+3, len(articles))):
-                article1 = articles[i]
-                article2 = articles[j]
-                
-                # Skip if both articles have the same sentiment
-                if article1["Sentiment"] == article2["Sentiment"]:
-                    continue
-                
-                # Get short version of titles for comparison (first 40 chars)
-                title1 = article1["Title"][:40] + "..." if len(article1["Title"]) > 40 else article1["Title"]
-                title2 = article2["Title"][:40] + "..." if len(article2["Title"]) > 40 else article2["Title"]
-                
-                comparison = {
-                    "Comparison": f"Article '{title1}' has {article1['Sentiment'].lower()} sentiment, while '{title2}' has {article2['Sentiment'].lower()} sentiment.",
-                    "Impact": generate_impact_statement(article1, article2)
-                }
-                comparisons.append(comparison)
-    
-    # Limit to most significant comparisons
-    comparisons = comparisons[:3]
+    for i, j in find_contrasting_pairs(articles, topic_index):
+        article1 = articles[i]
+        article2 = articles[j]
+        
+        # Get short version of titles for comparison (first 40 chars)
+        title1 = article1.title[:40] + "..." if len(article1.title) > 40 else article1.title
+        title2 = article2.title[:40] + "..." if len(article2.title) > 40 else article2.title
+        
+        comparison = {
+            "Comparison": f"Article '{title1}' has {article1.sentiment.label.lower()} sentiment, while '{title2}' has {article2.sentiment.label.lower()} sentiment.",
+            "Impact": generate_impact_statement(article1, article2)
+        }
+        comparisons.append(comparison)
     
     # Create topic overlap analysis
     topic_overlap = {
@@ -465,7 +1076,7 @@ def perform_comparative_analysis(articles):
     
     # Find unique topics for each article
     for i, article in enumerate(articles):
-        unique_topics = [topic for topic in article["Topics"] if topic_frequency[topic] == 1]
+        unique_topics = [topic for topic in article.topics if len(topic_index[topic]) == 1]
         topic_overlap["Unique Topics"][f"Article {i+1}"] = unique_topics
     
     # Generate final sentiment analysis
@@ -479,74 +1090,244 @@ def perform_comparative_analysis(articles):
     }
 
 def generate_impact_statement(article1, article2):
+    article1 = as_processed_article(article1)
+    article2 = as_processed_article(article2)
+    
     # Generate an impact statement based on article sentiments and topics
-    if article1["Sentiment"] == "Positive" and article2["Sentiment"] == "Negative":
-        return f"The positive news about {', '.join(article1['Topics'][:2])} is offset by concerns regarding {', '.join(article2['Topics'][:2])}."
-    elif article1["Sentiment"] == "Negative" and article2["Sentiment"] == "Positive":
-        return f"While there are concerns about {', '.join(article1['Topics'][:2])}, positive developments in {', '.join(article2['Topics'][:2])} may balance the overall impact."
+    if article1.sentiment == Sentiment.POSITIVE and article2.sentiment == Sentiment.NEGATIVE:
+        return f"The positive news about {', '.join(article1.topics[:2])} is offset by concerns regarding {', '.join(article2.topics[:2])}."
+    elif article1.sentiment == Sentiment.NEGATIVE and article2.sentiment == Sentiment.POSITIVE:
+        return f"While there are concerns about {', '.join(article1.topics[:2])}, positive developments in {', '.join(article2.topics[:2])} may balance the overall impact."
     else:
-        return f"The articles present different perspectives on {', '.join(set(article1['Topics'][:1] + article2['Topics'][:1]))}."
+        return f"The articles present different perspectives on {', '.join(set(article1.topics[:1] + article2.topics[:1]))}."
 
 def determine_overall_sentiment(sentiment_counts, articles):
     # Determine overall sentiment based on distribution and article importance
-    total = sum(sentiment_counts.values())
+    lead_topics = as_processed_article(articles[0]).topics if articles else ()
+    lead_topic = lead_topics[0] if lead_topics else 'the company'
     
     if sentiment_counts["Positive"] > sentiment_counts["Negative"] + sentiment_counts["Neutral"]:
-        return f"Coverage is predominantly positive. Positive news about {articles[0]['Topics'][0] if articles and articles[0]['Topics'] else 'the company'} is particularly noteworthy."
+        return f"Coverage is predominantly positive. Positive news about {lead_topic} is particularly noteworthy."
     elif sentiment_counts["Negative"] > sentiment_counts["Positive"] + sentiment_counts["Neutral"]:
-        return f"Coverage shows significant concerns, particularly regarding {articles[0]['Topics'][0] if articles and articles[0]['Topics'] else 'the company'}."
+        return f"Coverage shows significant concerns, particularly regarding {lead_topic}."
     elif sentiment_counts["Positive"] > sentiment_counts["Negative"]:
-        return f"Coverage is cautiously positive, with some concerns noted about {articles[0]['Topics'][0] if articles and articles[0]['Topics'] else 'the company'}."
+        return f"Coverage is cautiously positive, with some concerns noted about {lead_topic}."
     elif sentiment_counts["Negative"] > sentiment_counts["Positive"]:
-        return f"Coverage leans negative, though there are some positive developments in {articles[0]['Topics'][0] if articles and articles[0]['Topics'] else 'the company'}."
+        return f"Coverage leans negative, though there are some positive developments in {lead_topic}."
     else:
-        return f"Coverage is mixed or neutral, with balanced perspectives on {articles[0]['Topics'][0] if articles and articles[0]['Topics'] else 'the company'}."
+        return f"Coverage is mixed or neutral, with balanced perspectives on {lead_topic}."
 
-def process_news_articles(company_name, news_articles):
-    processed_articles = []
+# Articles whose fingerprints differ by at most this many of 64 bits are treated as one story; negative disables
+NEAR_DUPLICATE_DISTANCE = int(os.getenv("NEAR_DUPLICATE_DISTANCE", "8"))
+
+@stage_duration.time(stage="dedup")
+def collapse_near_duplicates(news_articles, max_distance=None):
+    """
+    Collapse near-duplicate articles, such as syndicated copies with slightly
+    different headlines or trimmed snippets, into one representative each
     
-    for article in news_articles:
-        # Extract title - Now using the correct capitalized key 'Title'
-        title = article.get("Title", "Untitled")
-        
-        # Extract summary
-        summary = article.get("Summary", "No summary available")
-        
-        # Perform sentiment analysis
-        sentiment = analyze_sentiment(summary)
-        
-        # Extract topics
-        topics = extract_topics(summary)
+    Parameters:
+    news_articles (list): Article dicts or NewsArticle records
+    max_distance (int, optional): Maximum SimHash distance within a cluster, defaults to NEAR_DUPLICATE_DISTANCE
+    
+    Returns:
+    list: NewsArticle records, one per cluster in order of first appearance, with
+    cluster_size set to the number of articles it stands for
+    """
+    max_distance = NEAR_DUPLICATE_DISTANCE if max_distance is None else max_distance
+    news_articles = [article if isinstance(article, NewsArticle) else NewsArticle.from_dict(article) for article in news_articles]
+    
+    if max_distance < 0:
+        return news_articles
+    
+    clusters = cluster_near_duplicates([f"{article.title}\n{article.summary}" for article in news_articles], max_distance)
+    
+    representatives = []
+    for cluster in clusters:
+        representative = news_articles[cluster[0]]
+        representatives.append(NewsArticle(
+            representative.title, representative.link, representative.summary,
+            sum(news_articles[index].cluster_size for index in cluster)
+        ))
+    
+    near_duplicates_collapsed.inc(len(news_articles) - len(representatives))
+    
+    return representatives
+
+def analyze_summaries(summaries):
+    """
+    Run sentiment analysis and topic extraction for a list of summaries,
+    reusing cached results for any text that has been analyzed before
+    
+    Parameters:
+    summaries (list): Summary texts
+    
+    Returns:
+    list: One dict per summary with "Sentiment", "Polarity", "Compound" and "Topics" keys
+    """
+    results = nlp_cache.get_many(summaries)
+    
+    # Analyze each uncached text once, even if it appears several times
+    missing = [summary for summary in dict.fromkeys(summaries) if summary not in results]
+    
+    if missing:
+        sentiments = analyze_sentiment_batch(missing)
+        topics_per_text = extract_topics_batch(missing)
         
-        processed_article = {
-            "Title": title,
-            "Summary": summary,
-            "Sentiment": sentiment,
-            "Topics": topics
-        }
+        fresh_results = {}
+        for summary, sentiment, topics in zip(missing, sentiments, topics_per_text):
+            fresh_results[summary] = dict(sentiment, Topics=topics)
         
-        processed_articles.append(processed_article)
+        nlp_cache.set_many(fresh_results)
+        results.update(fresh_results)
+    
+    # Hand out copies so callers cannot modify cached entries
+    return [dict(results[summary], Topics=list(results[summary]["Topics"])) for summary in summaries]
+
+def build_processed_articles(news_articles, analyses):
+    """
+    Combine fetched articles with their sentiment/topic analyses
+    
+    Parameters:
+    news_articles (list): Article dicts or NewsArticle records
+    analyses (list): Matching results from analyze_summaries
+    
+    Returns:
+    list: ProcessedArticle records
+    """
+    processed_articles = []
+    
+    for article, analysis in zip(news_articles, analyses):
+        if not isinstance(article, NewsArticle):
+            article = NewsArticle.from_dict(article)
+        processed_articles.append(
+            ProcessedArticle(article.title, article.summary, analysis["Sentiment"], analysis["Topics"], article.cluster_size)
+        )
+    
+    articles_processed.inc(len(processed_articles))
     
+    return processed_articles
+
+def build_news_output(company_name, processed_articles):
+    """
+    Run the comparative analysis and assemble the final output for a company
+    
+    Parameters:
+    company_name (str): Company the articles are about
+    processed_articles (list): ProcessedArticle records
+    
+    Returns:
+    dict: JSON-ready output with "Company", "Articles", "Comparative Sentiment Score" and "Final Sentiment Analysis" keys
+    """
     # Perform comparative analysis
     comparative_analysis = perform_comparative_analysis(processed_articles)
     
-    # Create final output
-    output = {
+    # Create final output, converting records to the JSON shape only here
+    return {
         "Company": company_name,
-        "Articles": processed_articles,
+        "Articles": [article.to_dict() for article in processed_articles],
         "Comparative Sentiment Score": comparative_analysis,
         "Final Sentiment Analysis": comparative_analysis["Final Sentiment Analysis"]
     }
+
+def iter_processed_articles(news_articles, batch_size=8):
+    """
+    Process news articles incrementally, yielding each one as soon as its batch is analyzed
+    
+    Parameters:
+    news_articles (iterable): Article dicts with "Title" and "Summary" keys
+    batch_size (int, optional): Articles analyzed together; None analyzes everything in one pass
+    
+    Yields:
+    ProcessedArticle: Processed article record, in input order
+    """
+    iterator = iter(news_articles)
+    
+    while True:
+        batch = list(islice(iterator, batch_size)) if batch_size else list(iterator)
+        if not batch:
+            return
+        
+        batch = [article if isinstance(article, NewsArticle) else NewsArticle.from_dict(article) for article in batch]
+        
+        # Perform sentiment analysis and topic extraction for the whole batch in one pass
+        summaries = [article.summary for article in batch]
+        analyses = analyze_summaries(summaries)
+        
+        yield from build_processed_articles(batch, analyses)
+
+def process_news_articles(company_name, news_articles):
+    # Collapse syndicated copies first so they are analyzed and counted once
+    news_articles = collapse_near_duplicates(news_articles)
+    processed_articles = list(iter_processed_articles(news_articles, batch_size=None))
     
-    return output
+    return build_news_output(company_name, processed_articles)
+
+def process_news_batch(companies, num_articles=10, max_concurrency=8):
+    """
+    Fetch and analyze news for many companies, sharing one batched NLP pass
+    
+    Parameters:
+    companies (list): Company names
+    num_articles (int): Maximum number of articles per company
+    max_concurrency (int): Maximum number of news searches in flight at once
+    
+    Returns:
+    dict: {"Results": company -> process_news_articles output, "Errors": company -> error message}
+    """
+    fetched = get_news_articles_many(companies, num_articles, max_concurrency)
+    
+    results = {}
+    errors = {}
+    articles_by_company = {}
+    
+    for company_name, fetch_result in fetched.items():
+        if fetch_result["Error"] is not None:
+            errors[company_name] = fetch_result["Error"]
+        else:
+            articles_by_company[company_name] = collapse_near_duplicates(fetch_result["Articles"])
+    
+    # Analyze every company's summaries together so NLP work is batched (and deduplicated) across companies
+    all_summaries = [article.summary for news_articles in articles_by_company.values() for article in news_articles]
+    all_analyses = analyze_summaries(all_summaries)
+    
+    offset = 0
+    for company_name, news_articles in articles_by_company.items():
+        analyses = all_analyses[offset:offset + len(news_articles)]
+        offset += len(news_articles)
+        
+        results[company_name] = build_news_output(company_name, build_processed_articles(news_articles, analyses))
+    
+    return {"Results": results, "Errors": errors}
 
 # Modify your main function to include the speech generation
 if __name__ == "__main__":
-    company_name = input("Enter the company you want to know: ")
-    news_articles = get_news_articles(company_name)
+    import argparse
+    from profiling import new_request_id, profile_run, profiling_requested
+    
+    parser = argparse.ArgumentParser(description="Analyze news sentiment for a company")
+    parser.add_argument("company", nargs="?", help="Company to analyze; asked for interactively if omitted")
+    parser.add_argument("--profile", action="store_true", help="Profile the analysis with cProfile and tracemalloc")
+    parser.add_argument("--profile-dir", help="Directory for the profile and allocation report (default NEWS_PROFILE_DIR)")
+    args = parser.parse_args()
     
-    # Process articles with sentiment and topic analysis
-    processed_data = process_news_articles(company_name, news_articles)
+    company_name = args.company or input("Enter the company you want to know: ")
+    
+    if args.profile or profiling_requested():
+        with profile_run(company_name, new_request_id(), output_dir=args.profile_dir) as profile:
+            news_articles = get_news_articles(company_name)
+            processed_data = process_news_articles(company_name, news_articles)
+        
+        if "Skipped" in profile:
+            print(f"Profiling skipped: {profile['Skipped']}")
+        else:
+            print(f"Profile saved to: {profile['Profile']}")
+            print(f"Allocation report saved to: {profile['Report']}")
+    else:
+        news_articles = get_news_articles(company_name)
+        
+        # Process articles with sentiment and topic analysis
+        processed_data = process_news_articles(company_name, news_articles)
     
     # Display detailed results in English
     print(f"\nAnalysis Results for {company_name}:\n")
@@ -0,0 +1,257 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from a fast cache hit to a slow speech synthesis
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Parameters:
+        name (str): Metric name
+        documentation (str): Help text shown in the exposition
+        labelnames (tuple): Names of the labels every sample must be given
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        """
+        Render the metric in the Prometheus text exposition format
+
+        Returns:
+        list: Lines of the exposition, including HELP and TYPE
+        """
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.metric_type}"]
+        for suffix, names, values, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+    def _samples(self):
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. of processed articles or errors"""
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        """
+        Increase the counter
+
+        Parameters:
+        amount (float): Amount to add, must not be negative
+        **labels: Label values
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """
+        Get the current count
+
+        Parameters:
+        **labels: Label values
+
+        Returns:
+        float: The count, 0 if never increased
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("_total", self.labelnames, key, value) for key, value in items]
+
+class Histogram(_Metric):
+    """Distribution of observed values, e.g. stage durations, in cumulative buckets"""
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Parameters:
+        name (str): Metric name
+        documentation (str): Help text shown in the exposition
+        labelnames (tuple): Names of the labels every observation must be given
+        buckets (tuple): Sorted bucket upper bounds; +Inf is added automatically
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (last is +Inf), sum]
+
+    def observe(self, value, **labels):
+        """
+        Record one observation
+
+        Parameters:
+        value (float): Observed value
+        **labels: Label values
+        """
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the wall-clock duration of a block in seconds, even if it raises
+
+        Parameters:
+        **labels: Label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+
+        samples = []
+        bucket_names = self.labelnames + ("le",)
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(("_bucket", bucket_names, key + (_format_value(float(bound)),), cumulative))
+            samples.append(("_sum", self.labelnames, key, total))
+            samples.append(("_count", self.labelnames, key, cumulative))
+        return samples
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down
+
+    A gauge either holds values set explicitly or reads them from a callback
+    when the registry is rendered, so values that already live elsewhere,
+    such as cache statistics, cost nothing until someone scrapes them.
+    """
+    metric_type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        """
+        Parameters:
+        name (str): Metric name
+        documentation (str): Help text shown in the exposition
+        labelnames (tuple): Names of the labels every sample must be given
+        callback (callable, optional): Returns {label values tuple: value} when rendered
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self._values = {}
+
+    def set(self, value, **labels):
+        """
+        Set the gauge
+
+        Parameters:
+        value (float): New value
+        **labels: Label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+        if self.callback is not None:
+            values.update((tuple(str(value) for value in key), value) for key, value in self.callback().items())
+        return [("", self.labelnames, key, value) for key, value in sorted(values.items())]
+
+class Registry:
+    """Collection of metrics rendered together for a /metrics endpoint"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Add a metric to the registry
+
+        Parameters:
+        metric (Counter, Histogram or Gauge): Metric to add
+
+        Returns:
+        The metric
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Create and register a Counter"""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Create and register a Histogram"""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        """Create and register a Gauge"""
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+        str: The exposition
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Default registry shared by the pipeline and the API
+registry = Registry()
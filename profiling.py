@@ -0,0 +1,142 @@
+import cProfile
+import io
+import linecache
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+# "off" disables profiling, "header" profiles /api/news requests sent with an X-Profile header,
+# "all" profiles every /api/news request and CLI run
+PROFILE_MODE = os.getenv("NEWS_PROFILE", "off").lower()
+PROFILE_DIR = os.getenv("NEWS_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "news_analyzer_profiles"))
+PROFILE_TOP_N = int(os.getenv("NEWS_PROFILE_TOP_N", "25"))
+
+# tracemalloc is process-wide, so only one run is profiled at a time
+_profile_lock = threading.Lock()
+
+def profiling_requested(header_value=None):
+    """
+    Decide whether an analysis should be profiled
+
+    Parameters:
+    header_value (str, optional): Value of the request's X-Profile header, if any
+
+    Returns:
+    bool: True if NEWS_PROFILE is "all", or is "header" and the header is set to a true value
+    """
+    if PROFILE_MODE == "all":
+        return True
+    if PROFILE_MODE == "header" and header_value:
+        return header_value.strip().lower() in ("1", "true", "yes", "on")
+    return False
+
+def new_request_id():
+    """
+    Generate an ID for tagging a profiled run
+
+    Returns:
+    str: Random hex ID
+    """
+    return uuid.uuid4().hex[:16]
+
+def _slug(value):
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")[:40] or "unknown"
+
+@contextmanager
+def profile_run(company, request_id=None, output_dir=None, top_n=None):
+    """
+    Profile CPU time and memory allocations of the enclosed block
+
+    cProfile records the calling thread only, so work handed to thread pools
+    (such as fetching further results pages) shows up as waiting time. When
+    another run is already being profiled the block runs unprofiled.
+
+    Parameters:
+    company (str): Company being analyzed, used to tag the output files
+    request_id (str, optional): Request ID used to tag the output files, generated if omitted
+    output_dir (str, optional): Directory for the output files, defaults to NEWS_PROFILE_DIR
+    top_n (int, optional): Number of allocation sites and functions in the report, defaults to NEWS_PROFILE_TOP_N
+
+    Yields:
+    dict: Filled in when the block exits with "Request ID", "Profile" (pstats file) and
+    "Report" (text report) keys; holds only a "Skipped" key with the reason if the run was not profiled
+    """
+    result = {}
+
+    if not _profile_lock.acquire(blocking=False):
+        result["Skipped"] = "another run is being profiled"
+        yield result
+        return
+
+    try:
+        request_id = request_id or new_request_id()
+        output_dir = output_dir or PROFILE_DIR
+        top_n = top_n or PROFILE_TOP_N
+        os.makedirs(output_dir, exist_ok=True)
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        # reset_peak is new in Python 3.9; before that the peak covers the whole time tracemalloc has
+        # been tracing, which is the same thing unless it was already started outside this block
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile()
+        started_at = time.time()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            wall_time = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+
+            base = os.path.join(output_dir, f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(started_at))}-{_slug(company)}-{_slug(request_id)}")
+            profiler.dump_stats(f"{base}.prof")
+
+            report = _format_report(company, request_id, started_at, wall_time, peak, profiler, after.compare_to(before, "lineno"), top_n)
+            with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+                f.write(report)
+
+            result.update({"Request ID": request_id, "Profile": f"{base}.prof", "Report": f"{base}.txt"})
+    finally:
+        _profile_lock.release()
+
+def _format_report(company, request_id, started_at, wall_time, peak, profiler, allocation_diffs, top_n):
+    lines = [
+        f"Company: {company}",
+        f"Request ID: {request_id}",
+        f"Started: {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime(started_at))}",
+        f"Wall time: {wall_time:.3f} s",
+        f"Peak traced memory: {peak / (1024 * 1024):.1f} MiB",
+        "",
+        f"Top {top_n} allocation sites by net size:"
+    ]
+
+    # Allocations made inside the profiling machinery itself are noise
+    allocation_diffs = [diff for diff in allocation_diffs
+                        if diff.size_diff > 0 and not diff.traceback[0].filename.endswith(("tracemalloc.py", "cProfile.py", "profiling.py"))]
+    for rank, diff in enumerate(allocation_diffs[:top_n], 1):
+        frame = diff.traceback[0]
+        lines.append(f"{rank:>3}. {frame.filename}:{frame.lineno}: {diff.size_diff / 1024:.1f} KiB in {diff.count_diff} blocks")
+        source = linecache.getline(frame.filename, frame.lineno).strip()
+        if source:
+            lines.append(f"       {source}")
+
+    stats_output = io.StringIO()
+    pstats.Stats(profiler, stream=stats_output).sort_stats("cumulative").print_stats(top_n)
+
+    lines.extend(["", f"Top {top_n} functions by cumulative time:", stats_output.getvalue()])
+    return "\n".join(lines)
@@ -0,0 +1,131 @@
+import sys
+from enum import IntEnum
+
+class Sentiment(IntEnum):
+    """Article sentiment, stored as a small integer"""
+    NEGATIVE = -1
+    NEUTRAL = 0
+    POSITIVE = 1
+
+    @property
+    def label(self):
+        """str: The label used in JSON output, e.g. "Positive" """
+        return self.name.title()
+
+    @classmethod
+    def from_label(cls, label):
+        """
+        Look up a sentiment by its JSON label
+
+        Parameters:
+        label (str): "Positive", "Negative" or "Neutral"
+
+        Returns:
+        Sentiment: The matching member
+        """
+        return cls[label.upper()]
+
+class NewsArticle:
+    """Compact record for a fetched news article; cluster_size counts the near-duplicates it stands for"""
+    __slots__ = ("title", "link", "summary", "cluster_size")
+
+    def __init__(self, title, link, summary, cluster_size=1):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.cluster_size = cluster_size
+
+    @classmethod
+    def from_dict(cls, article):
+        """
+        Build a record from an article dict as returned by get_news_articles
+
+        Parameters:
+        article (dict): Article with "Title", "Link" and "Summary" keys, and optionally "Cluster Size"
+
+        Returns:
+        NewsArticle: The record
+        """
+        return cls(article.get("Title", "Untitled"), article.get("Link"), article.get("Summary", "No summary available"),
+                   article.get("Cluster Size", 1))
+
+    def to_dict(self):
+        """
+        Convert to the JSON shape used by the API
+
+        Returns:
+        dict: Article with "Title", "Link", "Summary" and "Cluster Size" keys
+        """
+        return {"Title": self.title, "Link": self.link, "Summary": self.summary, "Cluster Size": self.cluster_size}
+
+    def __eq__(self, other):
+        if not isinstance(other, NewsArticle):
+            return NotImplemented
+        return ((self.title, self.link, self.summary, self.cluster_size) ==
+                (other.title, other.link, other.summary, other.cluster_size))
+
+    def __repr__(self):
+        return f"NewsArticle(title={self.title!r}, link={self.link!r})"
+
+class ProcessedArticle:
+    """Compact record for an analyzed news article; topics are interned strings"""
+    __slots__ = ("title", "summary", "sentiment", "topics", "cluster_size")
+
+    def __init__(self, title, summary, sentiment, topics, cluster_size=1):
+        self.title = title
+        self.summary = summary
+        self.sentiment = sentiment if isinstance(sentiment, Sentiment) else Sentiment.from_label(sentiment)
+        # Topics repeat heavily across articles, so share one string object per distinct topic
+        self.topics = tuple(sys.intern(topic) for topic in topics)
+        self.cluster_size = cluster_size
+
+    @classmethod
+    def from_dict(cls, article):
+        """
+        Build a record from a processed article dict
+
+        Parameters:
+        article (dict): Article with "Title", "Summary", "Sentiment" and "Topics" keys, and optionally "Cluster Size"
+
+        Returns:
+        ProcessedArticle: The record
+        """
+        return cls(article["Title"], article["Summary"], article["Sentiment"], article["Topics"], article.get("Cluster Size", 1))
+
+    def to_dict(self):
+        """
+        Convert to the JSON shape used by the API
+
+        Returns:
+        dict: Article with "Title", "Summary", "Sentiment", "Topics" and "Cluster Size" keys
+        """
+        return {
+            "Title": self.title,
+            "Summary": self.summary,
+            "Sentiment": self.sentiment.label,
+            "Topics": list(self.topics),
+            "Cluster Size": self.cluster_size
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, ProcessedArticle):
+            return NotImplemented
+        return ((self.title, self.summary, self.sentiment, self.topics, self.cluster_size) ==
+                (other.title, other.summary, other.sentiment, other.topics, other.cluster_size))
+
+    def __repr__(self):
+        return f"ProcessedArticle(title={self.title!r}, sentiment={self.sentiment.label}, topics={list(self.topics)!r})"
+
+def as_processed_article(article):
+    """
+    Accept either a processed article dict or a ProcessedArticle record
+
+    Parameters:
+    article (dict or ProcessedArticle): Processed article
+
+    Returns:
+    ProcessedArticle: The record
+    """
+    if isinstance(article, ProcessedArticle):
+        return article
+    return ProcessedArticle.from_dict(article)
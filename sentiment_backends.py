@@ -0,0 +1,487 @@
+import math
+import os
+import string
+import threading
+import warnings
+
+# NLTK and TextBlob are imported when a backend is first loaded so that importing this module stays fast
+
+def sentiment_label(polarity, compound):
+    """
+    Combine TextBlob polarity and VADER compound scores into a sentiment label
+
+    Parameters:
+    polarity (float): TextBlob polarity score
+    compound (float): VADER compound score
+
+    Returns:
+    str: "Positive", "Negative" or "Neutral"
+    """
+    # Combine both approaches for more robust analysis
+    if polarity > 0.1 or compound > 0.05:
+        return "Positive"
+    elif polarity < -0.1 or compound < -0.05:
+        return "Negative"
+    else:
+        return "Neutral"
+
+def _add_nltk_data_path():
+    import nltk
+
+    # Look for NLTK resources in the user's home directory (USERPROFILE on Windows)
+    home_dir = os.getenv("USERPROFILE") or os.path.expanduser("~")
+    path = os.path.join(home_dir, "nltk_data")
+    if path not in nltk.data.path:
+        nltk.data.path.append(path)
+
+class SentimentBackend:
+    """
+    Scores texts with TextBlob-style polarity and VADER-style compound scores
+
+    Subclasses implement load() and score(); results are labeled with
+    sentiment_label so every backend produces the same output shape.
+    """
+    name = None
+
+    def __init__(self):
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        """Load lexicons and models, once per instance"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+
+    def analyze(self, texts):
+        """
+        Score a list of texts
+
+        Parameters:
+        texts (list): Texts to analyze
+
+        Returns:
+        list: One dict per text with "Sentiment", "Polarity" and "Compound" keys
+        """
+        self.load()
+
+        results = []
+        for polarity, compound in self.score(texts):
+            results.append({
+                "Sentiment": sentiment_label(polarity, compound),
+                "Polarity": polarity,
+                "Compound": compound
+            })
+
+        return results
+
+    def score(self, texts):
+        """
+        Compute raw scores for a list of texts
+
+        Parameters:
+        texts (list): Texts to analyze
+
+        Returns:
+        list: (polarity, compound) tuples
+        """
+        raise NotImplementedError
+
+    def _load(self):
+        raise NotImplementedError
+
+class CombinedBackend(SentimentBackend):
+    """Runs TextBlob's PatternAnalyzer and NLTK's VADER analyzer on every text"""
+    name = "combined"
+
+    def _load(self):
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        from textblob.en.sentiments import PatternAnalyzer
+
+        _add_nltk_data_path()
+
+        # TextBlob(text).sentiment delegates to a PatternAnalyzer, so calling it directly gives the same scores
+        self.pattern_analyzer = PatternAnalyzer()
+        self.vader_analyzer = SentimentIntensityAnalyzer()
+
+    def score(self, texts):
+        return [
+            (self.pattern_analyzer.analyze(text).polarity, self.vader_analyzer.polarity_scores(text)['compound'])
+            for text in texts
+        ]
+
+class LexiconBackend(SentimentBackend):
+    """
+    Single-pass reimplementation of the combined TextBlob and VADER scoring
+
+    Both lexicons are merged into one dict, every text is split on whitespace
+    once, and the per-token work both scorers need (punctuation stripping,
+    contraction splitting, lowercasing) is cached across texts. The scoring
+    rules follow TextBlob's Pattern analyzer and NLTK's VADER, so labels match
+    the combined backend; tests/test_sentiment.py and benchmarks/bench_sentiment.py
+    check the agreement.
+
+    The rules read TextBlob's private _text module and NLTK's VaderConstants.
+    If a TextBlob or NLTK release drops any of them, the backend warns and
+    delegates to the combined backend instead.
+    """
+    name = "lexicon"
+
+    # Bound on cached token views; the cache is simply cleared when it fills up
+    TOKEN_CACHE_SIZE = 200000
+
+    # Internals the scoring rules read, checked when the backend loads
+    TEXT_MODULE_NAMES = ("PUNCTUATION", "EMOTICONS", "replacements", "ABBREVIATIONS", "RE_ABBR1", "RE_ABBR2",
+                         "RE_ABBR3", "RE_SARCASM", "RE_EMOTICONS")
+    PATTERN_NAMES = ("negations", "modifier", "modifiers", "items")
+    VADER_NAMES = ("PUNC_LIST", "NEGATE", "BOOSTER_DICT", "SPECIAL_CASE_IDIOMS", "C_INCR", "N_SCALAR", "B_DECR")
+
+    def _load(self):
+        self.fallback = None
+        try:
+            self._load_lexicons()
+        except (ImportError, AttributeError) as e:
+            warnings.warn(f"The {self.name} sentiment backend does not support the installed TextBlob or NLTK "
+                          f"({e}); falling back to the {CombinedBackend.name} backend", RuntimeWarning)
+            self.fallback = CombinedBackend()
+            self.fallback.load()
+
+    def _load_lexicons(self):
+        import nltk
+        from nltk.sentiment.vader import VaderConstants
+        from textblob import _text
+        from textblob.en import sentiment as pattern_sentiment
+
+        for module, names in ((_text, self.TEXT_MODULE_NAMES), (pattern_sentiment, self.PATTERN_NAMES),
+                              (VaderConstants, self.VADER_NAMES)):
+            missing = [name for name in names if not hasattr(module, name)]
+            if missing:
+                raise AttributeError(f"{module.__name__} has no {', '.join(missing)}")
+
+        _add_nltk_data_path()
+
+        self.vader = VaderConstants
+        self.text_module = _text
+        self.vader_punctuation = set(string.punctuation)
+        self.vader_punc_list = set(VaderConstants.PUNC_LIST)
+        self.pattern_punctuation = tuple(_text.PUNCTUATION.replace(".", ""))
+        self.pattern_negations = pattern_sentiment.negations
+        self.pattern_modifier = pattern_sentiment.modifier
+        self.emoticons = {}
+        for (_, polarity), emoticons in _text.EMOTICONS.items():
+            for emoticon in emoticons:
+                self.emoticons.setdefault(emoticon.lower(), polarity)
+
+        # word -> [VADER valence, Pattern polarity, Pattern intensity, Pattern modifier flag]
+        lexicon = {}
+
+        vader_lexicon = nltk.data.load("sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt")
+        for line in vader_lexicon.split("\n"):
+            word, measure = line.strip().split("\t")[0:2]
+            lexicon[word] = [float(measure), None, None, False]
+
+        # items() loads the lazy XML lexicon; only the part-of-speech independent scores are used
+        for word, tags in pattern_sentiment.items():
+            if None not in tags:
+                continue
+            polarity, _, intensity = tags[None]
+            entry = lexicon.setdefault(word, [None, None, None, False])
+            entry[1:] = [polarity, intensity, any(map(tags.__contains__, pattern_sentiment.modifiers))]
+
+        self.lexicon = {word: tuple(entry) for word, entry in lexicon.items()}
+        self._token_cache = {}
+
+    def score(self, texts):
+        if self.fallback is not None:
+            return self.fallback.score(texts)
+        return [self._score_text(text) for text in texts]
+
+    def _score_text(self, text):
+        vader_words = []
+        pattern_tokens = []
+
+        for raw_token in text.split():
+            vader_word, tokens = self._token_views(raw_token)
+            if vader_word is not None:
+                vader_words.append(vader_word)
+            pattern_tokens.extend(tokens)
+
+        polarity = self._pattern_polarity(pattern_tokens)
+        compound = self._vader_compound(vader_words, text)
+        return polarity, compound
+
+    def _token_views(self, raw_token):
+        views = self._token_cache.get(raw_token)
+        if views is None:
+            if len(self._token_cache) >= self.TOKEN_CACHE_SIZE:
+                self._token_cache.clear()
+            views = (self._vader_word(raw_token), tuple(self._pattern_tokens(raw_token)))
+            self._token_cache[raw_token] = views
+        return views
+
+    def _vader_word(self, token):
+        # VADER drops single characters and strips one listed punctuation run from
+        # either end when the rest of the token is free of punctuation
+        if len(token) <= 1:
+            return None
+
+        stripped = token.rstrip(string.punctuation)
+        if self._vader_strippable(stripped, token[len(stripped):]):
+            return stripped
+        stripped = token.lstrip(string.punctuation)
+        if self._vader_strippable(stripped, token[:len(token) - len(stripped)]):
+            return stripped
+
+        return token
+
+    def _vader_strippable(self, word, run):
+        return (run in self.vader_punc_list and len(word) > 1
+                and not any(char in self.vader_punctuation for char in word))
+
+    def _pattern_tokens(self, token):
+        # Per-token part of TextBlob's find_tokens: contractions, quotes and punctuation are split off
+        text_module = self.text_module
+        for contraction, replacement in text_module.replacements.items():
+            token = token.replace(contraction, replacement)
+        for quote in ("“", "”", "‘", "’", "'", '"'):
+            token = token.replace(quote, f" {quote} ")
+
+        tokens = []
+        for t in token.split():
+            tail = []
+            while t.startswith(self.pattern_punctuation) and t not in text_module.replacements:
+                tokens.append(t[0])
+                t = t[1:]
+            while t.endswith(self.pattern_punctuation + (".",)) and t not in text_module.replacements:
+                if t.endswith(self.pattern_punctuation):
+                    tail.append(t[-1])
+                    t = t[:-1]
+                if t.endswith("..."):
+                    tail.append("...")
+                    t = t[:-3].rstrip(".")
+                if t.endswith("."):
+                    if (t in text_module.ABBREVIATIONS or text_module.RE_ABBR1.match(t) is not None
+                            or text_module.RE_ABBR2.match(t) is not None or text_module.RE_ABBR3.match(t) is not None):
+                        break
+                    tail.append(t[-1])
+                    t = t[:-1]
+            if t != "":
+                tokens.append(t)
+            tokens.extend(reversed(tail))
+        return tokens
+
+    def _pattern_polarity(self, tokens):
+        text_module = self.text_module
+        joined = " ".join(tokens)
+
+        # Sarcasm marks and emoticons split apart by the tokenizer are joined back together
+        if "(" in joined:
+            joined = text_module.RE_SARCASM.sub("(!)", joined)
+        joined = text_module.RE_EMOTICONS.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), joined)
+
+        lexicon = self.lexicon
+        negations = self.pattern_negations
+        assessments = []  # [polarity, intensity, negated]
+        modifier = None
+        negation = None
+
+        for word in joined.lower().split():
+            entry = lexicon.get(word)
+            if entry is not None and entry[1] is not None:
+                _, polarity, intensity, is_modifier = entry
+                if modifier is None:
+                    assessments.append([polarity, intensity, False])
+                else:
+                    # "really good": the modifier's assessment becomes the modified word's
+                    assessments[-1][0] = max(-1.0, min(polarity * assessments[-1][1], 1.0))
+                    assessments[-1][1] = intensity
+                if negation is not None:
+                    assessments[-1][1] = 1.0 / assessments[-1][1]
+                    assessments[-1][2] = True
+                modifier = word if is_modifier else None
+                negation = word if word in negations else None
+            else:
+                if word in negations:
+                    negation = word
+                elif negation and len(word.strip("'")) > 1:
+                    negation = None
+                if negation is not None and modifier is not None and self.pattern_modifier(modifier):
+                    assessments[-1][2] = True
+                    negation = None
+                elif modifier and len(word) > 2:
+                    modifier = None
+                if word == "!" and assessments:
+                    assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+                if word == "(!)":
+                    assessments.append([0.0, 1.0, False])
+                if not word.isalpha() and len(word) <= 5 and word not in text_module.PUNCTUATION:
+                    emoticon_polarity = self.emoticons.get(word)
+                    if emoticon_polarity is not None:
+                        assessments.append([emoticon_polarity, 1.0, False])
+
+        if not assessments:
+            return 0.0
+
+        # "not good" = slightly bad, "not bad" = slightly good
+        return sum(polarity * -0.5 if negated else polarity for polarity, _, negated in assessments) / float(len(assessments))
+
+    def _vader_compound(self, words, text):
+        vader = self.vader
+        lexicon = self.lexicon
+        lowers = [word.lower() for word in words]
+        uppers = [word.isupper() for word in words]
+        count = len(words)
+        is_cap_diff = 0 < count - sum(uppers) < count
+
+        def known(index):
+            entry = lexicon.get(lowers[index])
+            return entry is not None and entry[0] is not None
+
+        def negated(word):
+            word = word.lower()
+            return word in vader.NEGATE or "n't" in word
+
+        def valence_at(i):
+            valence = lexicon[lowers[i]][0]
+
+            # Sentiment-laden word in ALL CAPS while others aren't
+            if uppers[i] and is_cap_diff:
+                valence += vader.C_INCR if valence > 0 else -vader.C_INCR
+
+            for start_i in range(3):
+                if i > start_i and not known(i - (start_i + 1)):
+                    previous = i - (start_i + 1)
+                    scalar = 0.0
+                    if lowers[previous] in vader.BOOSTER_DICT:
+                        scalar = vader.BOOSTER_DICT[lowers[previous]]
+                        if valence < 0:
+                            scalar *= -1
+                        if uppers[previous] and is_cap_diff:
+                            scalar += vader.C_INCR if valence > 0 else -vader.C_INCR
+                    if start_i == 1 and scalar != 0:
+                        scalar *= 0.95
+                    if start_i == 2 and scalar != 0:
+                        scalar *= 0.9
+                    valence += scalar
+                    valence = never_check(valence, start_i, i)
+                    if start_i == 2:
+                        valence = idioms_check(valence, i)
+
+            # Negation through "least"
+            if i > 1 and not known(i - 1) and lowers[i - 1] == "least":
+                if lowers[i - 2] != "at" and lowers[i - 2] != "very":
+                    valence *= vader.N_SCALAR
+            elif i > 0 and not known(i - 1) and lowers[i - 1] == "least":
+                valence *= vader.N_SCALAR
+            return valence
+
+        def never_check(valence, start_i, i):
+            if start_i == 0:
+                if negated(words[i - 1]):
+                    valence *= vader.N_SCALAR
+            elif start_i == 1:
+                if words[i - 2] == "never" and words[i - 1] in ("so", "this"):
+                    valence *= 1.5
+                elif negated(words[i - 2]):
+                    valence *= vader.N_SCALAR
+            elif start_i == 2:
+                if words[i - 3] == "never" and words[i - 2] in ("so", "this") or words[i - 1] in ("so", "this"):
+                    valence *= 1.25
+                elif negated(words[i - 3]):
+                    valence *= vader.N_SCALAR
+            return valence
+
+        def idioms_check(valence, i):
+            one_zero = f"{words[i - 1]} {words[i]}"
+            two_one_zero = f"{words[i - 2]} {words[i - 1]} {words[i]}"
+            two_one = f"{words[i - 2]} {words[i - 1]}"
+            three_two_one = f"{words[i - 3]} {words[i - 2]} {words[i - 1]}"
+            three_two = f"{words[i - 3]} {words[i - 2]}"
+
+            for sequence in (one_zero, two_one_zero, two_one, three_two_one, three_two):
+                if sequence in vader.SPECIAL_CASE_IDIOMS:
+                    valence = vader.SPECIAL_CASE_IDIOMS[sequence]
+                    break
+
+            if count - 1 > i:
+                zero_one = f"{words[i]} {words[i + 1]}"
+                if zero_one in vader.SPECIAL_CASE_IDIOMS:
+                    valence = vader.SPECIAL_CASE_IDIOMS[zero_one]
+            if count - 1 > i + 1:
+                zero_one_two = f"{words[i]} {words[i + 1]} {words[i + 2]}"
+                if zero_one_two in vader.SPECIAL_CASE_IDIOMS:
+                    valence = vader.SPECIAL_CASE_IDIOMS[zero_one_two]
+
+            if three_two in vader.BOOSTER_DICT or two_one in vader.BOOSTER_DICT:
+                valence += vader.B_DECR
+            return valence
+
+        # VADER scores every repeat of a word in the context of its first occurrence
+        first_index = {}
+        valences = {}
+        sentiments = []
+
+        for position, word in enumerate(words):
+            i = first_index.setdefault(word, position)
+            lower = lowers[i]
+            if (i < count - 1 and lower == "kind" and lowers[i + 1] == "of") or lower in vader.BOOSTER_DICT:
+                sentiments.append(0)
+            elif not known(i):
+                sentiments.append(0)
+            else:
+                if i not in valences:
+                    valences[i] = valence_at(i)
+                sentiments.append(valences[i])
+
+        # Sentiment before "but" is dampened and after it amplified
+        if "but" in lowers:
+            but_index = lowers.index("but")
+            sentiments = [sentiment * 0.5 if index < but_index else sentiment * 1.5 if index > but_index else sentiment
+                          for index, sentiment in enumerate(sentiments)]
+
+        if not sentiments:
+            return 0.0
+
+        total = float(sum(sentiments))
+
+        # Emphasis from exclamation points (up to 4) and question marks (2 or more)
+        question_marks = text.count("?")
+        emphasis = min(text.count("!"), 4) * 0.292
+        if question_marks > 1:
+            emphasis += question_marks * 0.18 if question_marks <= 3 else 0.96
+        if total > 0:
+            total += emphasis
+        elif total < 0:
+            total -= emphasis
+
+        return round(total / math.sqrt(total * total + 15), 4)
+
+# Backend name -> class, selected with the SENTIMENT_BACKEND environment variable
+BACKENDS = {
+    CombinedBackend.name: CombinedBackend,
+    LexiconBackend.name: LexiconBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+def get_sentiment_backend(name):
+    """
+    Get the shared instance of a sentiment backend
+
+    Parameters:
+    name (str): Backend name, one of BACKENDS
+
+    Returns:
+    SentimentBackend: The backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend {name!r}; choose from {', '.join(BACKENDS)}")
+
+    backend = _backends.get(name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.setdefault(name, BACKENDS[name]())
+    return backend
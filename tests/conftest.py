@@ -0,0 +1,24 @@
+import glob
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_DIR, "benchmarks", "fixtures")
+
+sys.path.insert(0, REPO_DIR)
+
+@pytest.fixture(scope="session")
+def news_texts():
+    """News sentences from the benchmark fixture corpus and the summaries on the saved result pages"""
+    import main
+
+    with open(os.path.join(FIXTURES_DIR, "sentiment_corpus.txt"), 'r', encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip()]
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(card["Summary"] for card in main.parse_news_cards(f.read()))
+
+    return texts
@@ -0,0 +1,44 @@
+import pytest
+
+from sentiment_backends import CombinedBackend, LexiconBackend, _add_nltk_data_path
+
+def _vader_lexicon_missing():
+    try:
+        import nltk
+        import textblob  # noqa: F401
+    except ImportError:
+        return True
+    _add_nltk_data_path()
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+    except LookupError:
+        return True
+    return False
+
+pytestmark = pytest.mark.skipif(_vader_lexicon_missing(), reason="NLTK, TextBlob or the VADER lexicon is not installed")
+
+@pytest.fixture(scope="module")
+def expected(news_texts):
+    return CombinedBackend().analyze(news_texts)
+
+def assert_same_results(results, expected):
+    assert [result["Sentiment"] for result in results] == [result["Sentiment"] for result in expected]
+    for result, expected_result in zip(results, expected):
+        assert result["Polarity"] == pytest.approx(expected_result["Polarity"], abs=1e-9)
+        assert result["Compound"] == pytest.approx(expected_result["Compound"], abs=1e-4)
+
+def test_lexicon_matches_combined(news_texts, expected):
+    backend = LexiconBackend()
+
+    assert_same_results(backend.analyze(news_texts), expected)
+    assert backend.fallback is None
+
+def test_lexicon_falls_back_without_library_internals(news_texts, expected, monkeypatch):
+    monkeypatch.setattr(LexiconBackend, "VADER_NAMES", LexiconBackend.VADER_NAMES + ("REMOVED_CONSTANT",))
+    backend = LexiconBackend()
+
+    with pytest.warns(RuntimeWarning, match="falling back"):
+        backend.load()
+
+    assert isinstance(backend.fallback, CombinedBackend)
+    assert_same_results(backend.analyze(news_texts), expected)
@@ -0,0 +1,32 @@
+import importlib.util
+
+import pytest
+
+import main
+
+requires_model = pytest.mark.skipif(importlib.util.find_spec(main.SPACY_MODEL) is None,
+                                    reason=f"spaCy model {main.SPACY_MODEL} is not installed")
+
+@requires_model
+def test_batch_matches_single_text_extraction(news_texts):
+    expected = [main.extract_topics(text, mode="spacy") for text in news_texts]
+
+    assert main.extract_topics_batch(news_texts, mode="spacy") == expected
+
+@requires_model
+def test_batch_matches_single_text_extraction_with_small_batches(news_texts):
+    expected = [main.extract_topics(text, mode="spacy") for text in news_texts]
+
+    assert main.extract_topics_batch(news_texts, batch_size=7, mode="spacy") == expected
+
+@pytest.mark.parametrize("mode", ["keyword", "Keywords", "SpaCy"])
+def test_unknown_mode_is_rejected_by_both_paths(mode):
+    with pytest.raises(ValueError, match="Unknown topic mode"):
+        main.extract_topics("Tesla shares jumped after record deliveries.", mode=mode)
+    with pytest.raises(ValueError, match="Unknown topic mode"):
+        main.extract_topics_batch(["Tesla shares jumped after record deliveries."], mode=mode)
+
+def test_keyword_batch_matches_single_text_extraction(news_texts):
+    expected = [main.extract_topics(text, mode="keywords") for text in news_texts]
+
+    assert main.extract_topics_batch(news_texts, mode="keywords") == expected